@@ -753,8 +753,8 @@ def build_gui():
 
             if messages:
                 status_log.config(state="normal")
-                for msg in messages:
-                    status_log.insert("end", msg + "\n")
+                # One insert for the whole batch: a single Tcl call and layout pass
+                status_log.insert("end", "\n".join(messages) + "\n")
                 status_log.see("end")
                 status_log.config(state="disabled")
                 status_log.update_idletasks()
@@ -20,10 +20,16 @@ import threading
 import queue
 from datetime import datetime
 
+try:
+    import orjson  # type: ignore
+    _HAS_ORJSON = True
+except Exception:
+    _HAS_ORJSON = False
+
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(__file__))
 
-from src.collector import Chala HandbagsCollector, SITE_CONFIG
+from src.collector import ChalaCollector, SITE_CONFIG
 
 # Configuration file path
 APP_DIR = Path(__file__).parent
@@ -46,6 +52,24 @@ DEFAULT_CONFIG = {
 }
 
 
+# Last config read or written, keyed by the file's (mtime_ns, size)
+_CONFIG_CACHE = {}
+
+
+def _config_stamp():
+    """Modification stamp of the config file."""
+    st = CONFIG_FILE.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def _with_defaults(config):
+    """Add default values for any fields missing from a loaded config."""
+    for key, value in DEFAULT_CONFIG.items():
+        if key not in config:
+            config[key] = value
+    return config
+
+
 def load_config():
     """Load configuration or create with defaults."""
     if not CONFIG_FILE.exists():
@@ -53,13 +77,21 @@ def load_config():
         return DEFAULT_CONFIG.copy()
 
     try:
-        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-            config = json.load(f)
-            # Merge with defaults in case new fields were added
-            for key, value in DEFAULT_CONFIG.items():
-                if key not in config:
-                    config[key] = value
-            return config
+        stamp = _config_stamp()
+        cached = _CONFIG_CACHE.get(stamp)
+        if cached is not None:
+            return cached.copy()
+
+        if _HAS_ORJSON:
+            config = orjson.loads(CONFIG_FILE.read_bytes())
+        else:
+            with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+                config = json.load(f)
+        # Merge with defaults in case new fields were added
+        config = _with_defaults(config)
+        _CONFIG_CACHE.clear()
+        _CONFIG_CACHE[stamp] = config.copy()
+        return config
     except Exception as e:
         logging.error(f"Config load error: {e}")
         return DEFAULT_CONFIG.copy()
@@ -68,12 +100,28 @@ def load_config():
 def save_config(config):
     """Save configuration to JSON file."""
     try:
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=4)
+        # Both writers use orjson's only layout: 2-space indent, raw UTF-8
+        if _HAS_ORJSON:
+            CONFIG_FILE.write_bytes(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+        else:
+            with open(CONFIG_FILE, "w", encoding="utf-8") as f:
+                json.dump(config, f, indent=2, ensure_ascii=False)
+        # What was just written is the current file content
+        _CONFIG_CACHE.clear()
+        _CONFIG_CACHE[_config_stamp()] = _with_defaults(dict(config))
     except Exception as e:
         logging.error(f"Config save error: {e}")
 
 
+def _product_key(product):
+    """Skip-mode lookup key of a product: its UPC, else item_<item #>, else None."""
+    upc = product.get('upc_updated') or product.get('upc', '')
+    if upc:
+        return upc
+    item_num = product.get('item_#', '')
+    return f"item_{item_num}" if item_num else None
+
+
 def build_gui():
     """Build and launch the GUI."""
     # Load configuration
@@ -89,6 +137,24 @@ def build_gui():
     button_control_queue = queue.Queue()
     messagebox_queue = queue.Queue()  # For thread-safe messagebox calls
 
+    # Debounced config auto-save: a burst of keystrokes writes the file once
+    save_after_id = None
+
+    def flush_save():
+        """Write the config now, dropping any scheduled save."""
+        nonlocal save_after_id
+        if save_after_id is not None:
+            app.after_cancel(save_after_id)
+            save_after_id = None
+        save_config(cfg)
+
+    def schedule_save():
+        """Save the config once edits pause for 500 ms."""
+        nonlocal save_after_id
+        if save_after_id is not None:
+            app.after_cancel(save_after_id)
+        save_after_id = app.after(500, flush_save)
+
     # Toolbar
     toolbar = tb.Frame(app)
     toolbar.pack(side="top", fill="x", padx=5, pady=5)
@@ -151,7 +217,6 @@ def build_gui():
                     ("Excel files", "*.xlsx *.xlsm"),
                     ("All files", "*.*")
                 ]
-                ]
             )
             if filename:
                 input_var.set(filename)
@@ -169,7 +234,7 @@ def build_gui():
     def on_input_change(*args):
         try:
             cfg["INPUT_FILE"] = input_var.get()
-            save_config(cfg)
+            schedule_save()
         except Exception:
             pass
 
@@ -224,7 +289,7 @@ def build_gui():
     def on_output_change(*args):
         try:
             cfg["OUTPUT_FILE"] = output_var.get()
-            save_config(cfg)
+            schedule_save()
         except Exception:
             pass
 
@@ -279,7 +344,7 @@ def build_gui():
     def on_log_change(*args):
         try:
             cfg["LOG_FILE"] = log_var.get()
-            save_config(cfg)
+            schedule_save()
         except Exception:
             pass
 
@@ -369,7 +434,7 @@ def build_gui():
     def on_start_change(*args):
         try:
             cfg["START_RECORD"] = start_var.get()
-            save_config(cfg)
+            schedule_save()
         except Exception:
             pass
 
@@ -405,7 +470,7 @@ def build_gui():
     def on_end_change(*args):
         try:
             cfg["END_RECORD"] = end_var.get()
-            save_config(cfg)
+            schedule_save()
         except Exception:
             pass
 
@@ -546,17 +611,12 @@ def build_gui():
                 if processing_mode == "skip" and os.path.exists(output_file):
                     status("Loading existing output file for skip mode...")
                     try:
-                        existing_products = load_products(output_file)
                         # Index by UPC or item_# for faster lookup
-                        existing_dict = {}
-                        for p in existing_products:
-                            upc = p.get('upc_updated') or p.get('upc', '')
-                            item_num = p.get('item_#', '')
-                            if upc:
-                                existing_dict[upc] = p
-                            elif item_num:
-                                existing_dict[f"item_{item_num}"] = p
-                        existing_products = existing_dict
+                        existing_products = {
+                            key: p
+                            for p in load_products(output_file)
+                            if (key := _product_key(p))
+                        }
                         status(f"✅ Loaded {len(existing_products)} existing records")
                     except Exception as e:
                         status(f"⚠ Could not load existing output: {str(e)}")
@@ -565,7 +625,7 @@ def build_gui():
 
                 # Initialize collector
                 status("Initializing collector...")
-                collector = Chala HandbagsCollector()
+                collector = ChalaCollector()
                 status("✅ Collector initialized")
                 status("")
 
@@ -685,8 +745,8 @@ def build_gui():
 
             if messages:
                 status_log.config(state="normal")
-                for msg in messages:
-                    status_log.insert("end", msg + "\n")
+                # One insert for the whole batch: a single Tcl call and layout pass
+                status_log.insert("end", "\n".join(messages) + "\n")
                 status_log.see("end")
                 status_log.config(state="disabled")
                 status_log.update_idletasks()
@@ -713,7 +773,7 @@ def build_gui():
                 except queue.Empty:
                     break
 
- except Exception as e:
+        except Exception as e:
             logging.error(f"Error processing queues: {e}", exc_info=True)
 
         # Schedule next check (50ms = 20 times per second)
@@ -734,7 +794,7 @@ def build_gui():
         """Handle window close event."""
         try:
             cfg["WINDOW_GEOMETRY"] = app.geometry()
-            save_config(cfg)
+            flush_save()
         except Exception as e:
             logging.warning(f"Failed to save window geometry: {e}")
         app.quit()
@@ -744,6 +804,10 @@ def build_gui():
     # Start main loop
     app.mainloop()
 
+    # The Exit button quits without on_closing; write any pending edit
+    if save_after_id is not None:
+        flush_save()
+
 
 if __name__ == "__main__":
     build_gui()
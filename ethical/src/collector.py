@@ -7,18 +7,23 @@ Collects product data from https://www.ethicalpet.com.
 
 import os
 import sys
+from types import MappingProxyType
 from typing import Dict, Any, Optional, Callable
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Add parent directory to path for shared imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
-from shared.src import load_json_file, save_json_file
+from shared.src import load_json_file, save_json_file, build_browser_headers
 from src.search import EthicalSearcher
 from src.parser import EthicalParser
 
 
-# Site Configuration (embedded from profile)
-SITE_CONFIG = {
+# Site Configuration (embedded from profile); read-only so shared defaults
+# can be bound directly by every collector instance without copying.
+SITE_CONFIG = MappingProxyType({
     "site_key": "ethical",
     "display_name": "Ethical Products (SPOT)",
     "homepage": "https://www.ethicalpet.com",
@@ -96,7 +101,7 @@ SITE_CONFIG = {
         "plain_text_descriptions": True,
         "variant_gallery_only": True
     }
-}
+})
 
 
 class EthicalCollector:
@@ -113,10 +118,69 @@ class EthicalCollector:
         self.searcher = EthicalSearcher(self.config)
         self.parser = EthicalParser(self.config)
 
+        # Pooled keep-alive HTTP session with retries
+        self.session = self._create_http_session()
+
+    def _create_http_session(self) -> requests.Session:
+        """
+        Create pooled HTTP session with retry logic.
+
+        The connection pool is sized so concurrent PDP verifications reuse
+        warm keep-alive connections instead of reconnecting per request.
+
+        Returns:
+            Configured requests Session
+        """
+        session = requests.Session()
+
+        retry_config = self.config.get("retry", {})
+        retry_strategy = Retry(
+            total=retry_config.get("tries", 3),
+            backoff_factor=retry_config.get("backoff", 1.0),
+            status_forcelist=[429, 500, 502, 503, 504],
+        )
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=retry_strategy,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        session.headers.update(build_browser_headers(
+            self.config.get("origin", ""),
+            referer=self.config.get("referer"),
+            user_agent=self.config.get("user_agent"),
+        ))
+
+        return session
+
+    def http_get(
+        self,
+        url: str,
+        timeout: Optional[int] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> requests.Response:
+        """
+        GET a URL through the pooled session.
+
+        Args:
+            url: URL to fetch
+            timeout: Read timeout in seconds (defaults to profile timeouts)
+            headers: Extra headers merged over the session defaults
+
+        Returns:
+            HTTP response
+        """
+        timeouts = self.config.get("timeouts", {})
+        connect = timeouts.get("connect", 15)
+        read = timeout or timeouts.get("read", 45)
+        return self.session.get(url, headers=headers, timeout=(connect, read))
+
     def find_product_url(
         self,
         upc: str,
-        http_get: Callable,
+        http_get: Optional[Callable] = None,
         timeout: int = 30,
         log: Callable = print,
         product_data: Optional[Dict[str, Any]] = None
@@ -128,16 +192,17 @@ class EthicalCollector:
 
         Args:
             upc: UPC to search for
-            http_get: HTTP GET function
+            http_get: HTTP GET function (defaults to the pooled session;
+                must be thread-safe, candidates are verified concurrently)
             timeout: Request timeout in seconds
-            log: Logging function
+            log: Logging function (must be thread-safe)
             product_data: Optional product metadata for better matching
 
         Returns:
             Product URL or None if not found
         """
         return self.searcher.find_product_url(
-            upc, http_get, timeout, log, product_data
+            upc, http_get or self.http_get, timeout, log, product_data
         )
 
     def parse_page(self, html_text: str) -> Dict[str, Any]:
@@ -14,8 +14,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from shared.src import strip_query_params, make_absolute_url, deduplicate_urls
 
 
-# Size suffix pattern
-SIZE_SUFFIX = re.compile(r"-(\d{2,4}x\d{2,4})(?=\.[a-z]{3,4}$)", re.I)
+# Size/scaled suffix pattern (handles stacked forms like "-scaled-300x300")
+SIZE_SUFFIX = re.compile(r"(?:-(?:\d{2,4}x\d{2,4}|scaled))+$", re.I)
 
 
 class EthicalImageProcessor:
@@ -77,7 +77,7 @@ class EthicalImageProcessor:
             return make_absolute_url(self.origin, hires)
 
         # Otherwise, remove size suffix
-        new_name = self._root_stem(stem) + ext
+        new_name = stem_root + ext
         if new_name != name:
             return u.rsplit("/", 1)[0] + "/" + new_name
 
@@ -191,6 +191,4 @@ class EthicalImageProcessor:
     @staticmethod
     def _root_stem(stem: str) -> str:
         """Remove size suffixes from stem."""
-        s = SIZE_SUFFIX.sub("", stem)
-        s = re.sub(r"-scaled$", "", s, flags=re.I)
-        return s
+        return SIZE_SUFFIX.sub("", stem)
@@ -15,6 +15,20 @@ from shared.src import text_only, deduplicate_urls
 from src.image_processor import EthicalImageProcessor
 
 
+# Pages smaller than this are parsed whole; larger ones are cut at </main>
+# so trailing JSON-LD, inline CSS and analytics never reach the tree builder.
+TRUNCATE_MIN_CHARS = 32 * 1024
+
+# Default Elastislide carousel selector and the alternates tried after it
+DEFAULT_CAROUSEL_SELECTOR = (
+    "div.elastislide-carousel ul.elastislide-list li img[data-largeimg]"
+)
+CAROUSEL_ALTERNATES = (
+    "#demo2carousel img[data-largeimg]",
+    ".elastislide-carousel .elastislide-list img[data-largeimg]",
+)
+
+
 class EthicalParser:
     """Parses Ethical Products pages."""
 
@@ -31,13 +45,11 @@ class EthicalParser:
 
         gallery_selectors = parsing_config.get("gallery_selectors", {})
         self.carousel_selector = gallery_selectors.get(
-            "carousel_images",
-            "div.elastislide-carousel ul.elastislide-list li img[data-largeimg]"
+            "carousel_images", DEFAULT_CAROUSEL_SELECTOR
         )
-        self.carousel_alternates = [
-            "#demo2carousel img[data-largeimg]",
-            ".elastislide-carousel .elastislide-list img[data-largeimg]"
-        ]
+        self.carousel_alternates = list(CAROUSEL_ALTERNATES)
+        # Full selector list is fixed per instance; build it once here
+        self.carousel_selectors = [self.carousel_selector] + self.carousel_alternates
 
         self.image_processor = EthicalImageProcessor(self.origin)
 
@@ -58,13 +70,15 @@ class EthicalParser:
             - log_lines: Processing log entries
             - manufacturer: Complete manufacturer data block
         """
-        soup = BeautifulSoup(html or "", "html.parser")
+        html = html or ""
+        content = self._truncate_after_main(html)
+        soup = BeautifulSoup(content, "html.parser")
 
         # Extract title
-        title = self._extract_title(html)
+        title = self._extract_title(content)
 
         # Extract description
-        description = self._extract_description(html)
+        description = self._extract_description(content)
 
         # Extract gallery images
         hires_map = self.image_processor.extract_hires_map(soup)
@@ -73,8 +87,7 @@ class EthicalParser:
         # Try Elastislide carousel first
         if soup.select_one("div.elastislide-carousel"):
             carousel_images = self.image_processor.extract_carousel_images(
-                soup,
-                [self.carousel_selector] + self.carousel_alternates
+                soup, self.carousel_selectors
             )
             images.extend(carousel_images)
 
@@ -89,9 +102,10 @@ class EthicalParser:
             for url in images
         ])
 
-        gallery_summary = f"found {len(images)} images"
-        if images:
-            gallery_summary += f"; first={images[0]}"
+        gallery_summary = (
+            f"found {len(images)} images; first={images[0]}"
+            if images else "found 0 images"
+        )
 
         return {
             "title": title or "",
@@ -112,6 +126,25 @@ class EthicalParser:
             },
         }
 
+    @staticmethod
+    def _truncate_after_main(html: str) -> str:
+        """
+        Drop everything after the closing </main> tag on large pages.
+
+        Title, description, gallery and meta selectors all live in <head>
+        or inside <main>, so the tail is dead weight for parsing.
+
+        Args:
+            html: Full page HTML
+
+        Returns:
+            HTML up to and including </main>, or the input unchanged
+        """
+        if len(html) < TRUNCATE_MIN_CHARS:
+            return html
+        end = html.find("</main>")
+        return html[:end + 7] if end != -1 else html
+
     def _extract_title(self, html: str) -> str:
         """Extract product title from HTML."""
         patterns = [
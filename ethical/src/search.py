@@ -5,13 +5,18 @@ Handles intelligent product discovery with sliding-scale matching.
 """
 
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Optional, Dict, Any, List, Tuple, Callable
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlsplit
+from lxml import html as lxml_html
 import os
 import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
-from shared.src import normalize_upc
+from shared.src import normalize_upc, compile_linear
 from src.text_matching import (
     normalize_name,
     extract_canonical_flavors,
@@ -22,6 +27,61 @@ from src.text_matching import (
 from src.size_matching import extract_sizes, sizes_match
 
 
+# Compiled patterns (flags baked in so hot paths skip the re cache lookup).
+# Whole-document scans use the linear-time RE2 backend when installed.
+# They run over the raw response bytes; only captured hrefs are decoded.
+_RE_HREF_PRODUCT = compile_linear(rb'href="([^"]+/product/[^"#?]+/)"', re.I)
+_RE_HREF_SLUG = compile_linear(rb'href="/product/([^"]+?)/"', re.I)
+_RE_PRODUCT_CAT = re.compile(r'product_cat-([a-z0-9\-]+)', re.I)
+_RE_DOG_WORD = re.compile(r"\bdog\b", re.I)
+_RE_CAT_WORD = re.compile(r"\bcat\b", re.I)
+_RE_WS = re.compile(r"\s+")
+
+# PDP title lookups, tried in order against one parsed tree
+_TITLE_XPATHS = (
+    '//div[starts-with(@class, "summary")]//h4',
+    '//h1[starts-with(@class, "product_title")]',
+    '//h1[starts-with(@class, "entry-title")]',
+)
+_TITLE_META_XPATHS = (
+    '//meta[@itemprop="name"]/@content',
+    '//meta[@property="og:title"]/@content',
+)
+_PRODUCT_DETAILS_CLASS_XPATH = '//div[starts-with(@class, "product-details")]/@class'
+
+_HTML_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+
+# Entries kept in each per-searcher LRU (search results, PDP metadata)
+CACHE_MAX_ENTRIES = 512
+
+# Candidates verified per query, fetched concurrently
+MAX_CANDIDATES = 10
+
+# Worker threads verifying candidates; one pool per searcher serves every query
+MAX_VERIFY_WORKERS = 4
+
+
+@lru_cache(maxsize=1024)
+def _query_bits(query_norm: str) -> Tuple[Tuple[str, ...], Dict[str, int], int]:
+    """
+    Index a normalized query for bitmask coverage counting.
+
+    Every query token position gets its own bit, so repeated tokens still
+    count once per occurrence (matching the old per-token membership sum).
+
+    Args:
+        query_norm: Normalized query string
+
+    Returns:
+        Tuple of (query tokens, token -> bits, mask of all query bits)
+    """
+    q_toks = tuple(query_norm.split())
+    tok_bits: Dict[str, int] = {}
+    for i, tok in enumerate(q_toks):
+        tok_bits[tok] = tok_bits.get(tok, 0) | (1 << i)
+    return q_toks, tok_bits, (1 << len(q_toks)) - 1
+
+
 class EthicalSearcher:
     """Handles intelligent product search for Ethical Products."""
 
@@ -33,9 +93,21 @@ class EthicalSearcher:
             config: Site configuration
         """
         self.origin = config.get("origin", "")
+        origin_parts = urlsplit(self.origin)
+        self._origin_root = (
+            f"{origin_parts.scheme}://{origin_parts.netloc}" if origin_parts.netloc else ""
+        )
         search_config = config.get("search", {})
         self.templates = search_config.get("templates", [])
         self.debug = search_config.get("debug", False)
+        # search URL -> candidate URLs, and PDP URL -> extracted metadata;
+        # both persist across UPCs so repeated queries and PDPs skip the network
+        self._search_cache: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._pdp_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Candidates are verified from worker threads
+        self._cache_lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
 
     def search_site(
         self,
@@ -54,29 +126,34 @@ class EthicalSearcher:
         Returns:
             List of candidate product URLs
         """
-        url = urljoin(self.origin, f"/?s={query}")
-        try:
-            response = http_get(url, timeout, headers={})
-            html = response.text if getattr(response, "status_code", 0) == 200 else ""
-        except Exception:
-            html = ""
+        url = self._abs_url(f"/?s={query}")
+        cached = self._cache_get(self._search_cache, url)
+        if cached is not None:
+            return list(cached)
+
+        content = self._fetch_content(url, http_get, timeout)
 
         candidates = []
         # Find product URLs
-        for match in re.finditer(r'href="([^"]+/product/[^"#?]+/)"', html, re.I):
-            candidates.append(urljoin(self.origin, match.group(1)))
-        for match in re.finditer(r'href="/product/([^"]+?)/"', html, re.I):
-            candidates.append(urljoin(self.origin, f"/product/{match.group(1)}/"))
+        for match in _RE_HREF_PRODUCT.finditer(content):
+            candidates.append(self._abs_url(match.group(1).decode("utf-8", "replace")))
+        for match in _RE_HREF_SLUG.finditer(content):
+            slug = match.group(1).decode("utf-8", "replace")
+            candidates.append(self._abs_url(f"/product/{slug}/"))
 
         # Deduplicate
         seen = set()
         result = []
-        for url in candidates:
-            if url not in seen:
-                seen.add(url)
-                result.append(url)
+        for candidate in candidates:
+            if candidate not in seen:
+                seen.add(candidate)
+                result.append(candidate)
 
-        return result[:12]
+        result = result[:12]
+        # Failed fetches are not cached so a later query can retry
+        if content:
+            self._cache_put(self._search_cache, url, result)
+        return list(result)
 
     def verify_product(
         self,
@@ -101,38 +178,29 @@ class EthicalSearcher:
         Returns:
             Tuple of (score, metadata, is_match)
         """
-        try:
-            response = http_get(pdp_url, timeout, headers={})
-            html = response.text if getattr(response, "status_code", 0) == 200 else ""
-        except Exception:
-            html = ""
-
-        # Extract product title
-        title = self._extract_title(html)
-        title_norm = normalize_name(title)
-        title_toks = title_norm.split()
-        slug = urlparse(pdp_url).path.strip("/").split("/")[-1]
-
-        # Extract product metadata
-        taxo = self._extract_taxonomy(html)
-        p_flavors = extract_canonical_flavors(html.upper())
-        p_lines = extract_canonical_line(title_norm)
-        p_forms = extract_form_tokens(title_norm)
-        p_sizes = extract_sizes(title)
+        pdp = self._pdp_metadata(pdp_url, http_get, timeout)
+        title = pdp["title"]
+        title_toks = pdp["title_toks"]
+        slug = pdp["slug"]
+        taxo = pdp["taxonomy"]
+        p_flavors = pdp["flavors"]
+        p_lines = pdp["lines"]
+        p_forms = pdp["forms"]
+        p_sizes = pdp["sizes"]
 
         # HARD GUARDS - reject mismatches
         expect_taxo = query_metadata.get("taxonomy", "")
-        if expect_taxo == "cat" and ("dog" in taxo or re.search(r"\bdog\b", title, re.I)):
+        if expect_taxo == "cat" and ("dog" in taxo or _RE_DOG_WORD.search(title)):
             return 0.0, {"reason": "reject: dog vs cat"}, False
-        if expect_taxo == "dog" and ("cat" in taxo or re.search(r"\bcat\b", title, re.I)):
+        if expect_taxo == "dog" and ("cat" in taxo or _RE_CAT_WORD.search(title)):
             return 0.0, {"reason": "reject: cat vs dog"}, False
 
         q_flavors = query_metadata.get("flavors", set())
-        if q_flavors and not (q_flavors & p_flavors):
+        if q_flavors and q_flavors.isdisjoint(p_flavors):
             return 0.0, {"reason": "reject: flavor mismatch"}, False
 
         q_lines = query_metadata.get("lines", set())
-        if q_lines and not (q_lines & p_lines):
+        if q_lines and q_lines.isdisjoint(p_lines):
             return 0.0, {"reason": "reject: line mismatch"}, False
 
         q_sizes = query_metadata.get("sizes", {})
@@ -140,9 +208,13 @@ class EthicalSearcher:
             return 0.0, {"reason": "reject: size mismatch"}, False
 
         # SLIDING-SCALE COVERAGE
-        q_toks = query_norm.split()
-        tset = set(title_toks + slug.upper().split("-"))
-        matches = sum(1 for t in q_toks if t in tset)
+        q_toks, tok_bits, q_mask = _query_bits(query_norm)
+        tset = set(title_toks)
+        tset.update(pdp["slug_toks"])
+        t_mask = 0
+        for t in tset:
+            t_mask |= tok_bits.get(t, 0)
+        matches = (q_mask & t_mask).bit_count()
         n_title = max(1, len(title_toks))
         coverage = matches / n_title
         q_cov = matches / max(1, len(q_toks))
@@ -163,7 +235,7 @@ class EthicalSearcher:
             form_hits = len(q_forms & p_forms)
             score += 1.5 * form_hits if form_hits else -0.8
 
-        slug_hits = sum(1 for tok in q_toks if tok and tok in slug.upper())
+        slug_hits = sum(1 for tok in q_toks if tok and tok in slug)
         if slug_hits >= 2:
             score += 0.6
 
@@ -181,22 +253,38 @@ class EthicalSearcher:
         """
         Find best matching product from candidates.
 
+        Candidates are verified on the searcher's worker pool (up to
+        MAX_VERIFY_WORKERS at once), so http_get and log are called from
+        several threads and must be thread-safe.
+
         Args:
             candidates: List of candidate URLs
             query_norm: Normalized query
             query_metadata: Query metadata
-            http_get: HTTP GET function
+            http_get: HTTP GET function (must be thread-safe)
             timeout: Request timeout
-            log: Logging function
+            log: Logging function (must be thread-safe)
 
         Returns:
             Best matching URL or None
         """
+        urls = candidates[:MAX_CANDIDATES]
+        results = []
+        if urls:
+            # PDP fetches are I/O bound; verify candidates concurrently and
+            # collate in candidate order so ranking ties stay stable
+            pool = self._verify_pool()
+            futures = [
+                pool.submit(
+                    self.verify_product,
+                    url, query_norm, query_metadata, http_get, timeout, log
+                )
+                for url in urls
+            ]
+            results = [future.result() for future in futures]
+
         ranked = []
-        for url in candidates[:10]:
-            score, meta, ok = self.verify_product(
-                url, query_norm, query_metadata, http_get, timeout, log
-            )
+        for url, (score, meta, ok) in zip(urls, results):
             if ok:
                 ranked.append((score, url, meta))
             elif self.debug:
@@ -251,36 +339,30 @@ class EthicalSearcher:
 
         metadata = {
             "taxonomy": taxonomy,
-            "flavors": q_flavors,
-            "lines": q_lines,
-            "forms": q_forms,
+            "flavors": frozenset(q_flavors),
+            "lines": frozenset(q_lines),
+            "forms": frozenset(q_forms),
             "sizes": q_sizes
         }
 
-        # Try UPC search
+        # Queries in priority order: UPC, description, title.
+        # Each entry is (search string, normalized query for scoring).
+        queries: List[Tuple[str, str]] = []
         if upc_digits:
-            for query in (upc_digits, f"%2B{upc_digits}"):
-                candidates = self.search_site(query, http_get, timeout)
-                hit = self.find_best_match(
-                    candidates, query, metadata, http_get, timeout, log
-                )
-                if hit:
-                    return hit
-
-        # Try description search
-        if desc:
-            q_norm = normalize_name(desc)
-            candidates = self.search_site(re.sub(r"\s+", "+", q_norm), http_get, timeout)
-            hit = self.find_best_match(
-                candidates, q_norm, metadata, http_get, timeout, log
-            )
-            if hit:
-                return hit
-
-        # Try title search
-        if title:
-            q_norm = normalize_name(title)
-            candidates = self.search_site(re.sub(r"\s+", "+", q_norm), http_get, timeout)
+            queries.append((upc_digits, upc_digits))
+            queries.append((f"%2B{upc_digits}", f"%2B{upc_digits}"))
+        for text in (desc, title):
+            if text:
+                q_norm = normalize_name(text)
+                queries.append((_RE_WS.sub("+", q_norm), q_norm))
+
+        searched = set()
+        for search_query, q_norm in queries:
+            if search_query in searched:
+                continue
+            searched.add(search_query)
+
+            candidates = self.search_site(search_query, http_get, timeout)
             hit = self.find_best_match(
                 candidates, q_norm, metadata, http_get, timeout, log
             )
@@ -289,41 +371,146 @@ class EthicalSearcher:
 
         return None
 
+    def _pdp_metadata(
+        self,
+        pdp_url: str,
+        http_get: Callable,
+        timeout: int
+    ) -> Dict[str, Any]:
+        """
+        Fetch a PDP and extract everything verify_product scores against.
+
+        Results are cached per URL, so a PDP surfaced by several queries (or
+        several UPCs) is fetched and parsed once.
+
+        Args:
+            pdp_url: Product page URL
+            http_get: HTTP GET function
+            timeout: Request timeout
+
+        Returns:
+            Dict of title, title_toks, slug (upper-cased), slug_toks, taxonomy,
+            flavors, lines, forms, sizes
+        """
+        cached = self._cache_get(self._pdp_cache, pdp_url)
+        if cached is not None:
+            return cached
+
+        content = self._fetch_content(pdp_url, http_get, timeout)
+
+        # Parse once from the raw bytes; title and taxonomy both read the tree
+        tree = self._parse_tree(content)
+        title = self._extract_title(tree)
+        title_norm = normalize_name(title)
+        slug = urlsplit(pdp_url).path.strip("/").split("/")[-1].upper()
+
+        pdp = {
+            "title": title,
+            "title_toks": title_norm.split(),
+            "slug": slug,
+            "slug_toks": tuple(slug.split("-")),
+            "taxonomy": self._extract_taxonomy(tree),
+            "flavors": extract_canonical_flavors(content.decode("utf-8", "replace")),
+            "lines": extract_canonical_line(title_norm),
+            "forms": extract_form_tokens(title_norm),
+            "sizes": extract_sizes(title),
+        }
+        if content:
+            self._cache_put(self._pdp_cache, pdp_url, pdp)
+        return pdp
+
+    def _verify_pool(self) -> ThreadPoolExecutor:
+        """Return the searcher's candidate-verification pool, creating it once."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=MAX_VERIFY_WORKERS, thread_name_prefix="ethical-verify"
+                )
+            return self._pool
+
+    def _cache_get(self, cache: OrderedDict, key: str) -> Optional[Any]:
+        """Look up an LRU entry, marking it most recently used."""
+        with self._cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _cache_put(self, cache: OrderedDict, key: str, value: Any) -> None:
+        """Store an LRU entry, evicting the oldest beyond CACHE_MAX_ENTRIES."""
+        with self._cache_lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > CACHE_MAX_ENTRIES:
+                cache.popitem(last=False)
+
+    def _abs_url(self, href: str) -> str:
+        """
+        Resolve an href against the site origin.
+
+        Root-relative and absolute hrefs (the only forms search results use)
+        are handled with string ops; anything else goes through urljoin.
+        """
+        if href.startswith("/") and not href.startswith("//") and self._origin_root:
+            return self._origin_root + href
+        if href.startswith(("http://", "https://")):
+            return href
+        return urljoin(self.origin, href)
+
+    @staticmethod
+    def _fetch_content(url: str, http_get: Callable, timeout: int) -> bytes:
+        """
+        GET a page and return its raw body (b"" on error or non-200).
+
+        The bytes are used as-is, skipping response.text charset detection
+        and decoding of the whole document.
+        """
+        try:
+            response = http_get(url, timeout, headers={})
+            return response.content if getattr(response, "status_code", 0) == 200 else b""
+        except Exception:
+            return b""
+
     @staticmethod
-    def _extract_title(html: str) -> str:
-        """Extract product title from HTML."""
-        from shared.src import text_only
+    def _parse_tree(content: bytes):
+        """Parse raw PDP HTML into an lxml tree (None if empty or unparseable)."""
+        if not content:
+            return None
+        try:
+            return lxml_html.document_fromstring(content, parser=_HTML_PARSER)
+        except Exception:
+            return None
 
-        patterns = [
-            r'<div[^>]+class="summary[^"]*"[^>]*>.*?<h4[^>]*>(.*?)</h4>',
-            r'<h1[^>]*class="product_title[^"]*"[^>]*>(.*?)</h1>',
-            r'<h1[^>]*class="entry-title[^"]*"[^>]*>(.*?)</h1>',
-        ]
+    @staticmethod
+    def _extract_title(tree) -> str:
+        """Extract product title from a parsed PDP tree."""
+        if tree is None:
+            return ""
 
-        for pattern in patterns:
-            match = re.search(pattern, html, re.I | re.DOTALL)
-            if match:
-                return text_only(match.group(1))
+        for xpath in _TITLE_XPATHS:
+            nodes = tree.xpath(xpath)
+            if nodes:
+                return nodes[0].text_content().strip()
 
-        match = re.search(r'<meta[^>]+itemprop="name"[^>]+content="([^"]+)"', html, re.I)
-        if match:
-            return match.group(1).strip()
+        for xpath in _TITLE_META_XPATHS:
+            values = tree.xpath(xpath)
+            if values and values[0].strip():
+                return values[0].strip()
 
-        match = re.search(r'<meta[^>]+property="og:title"[^>]+content="([^"]+)"', html, re.I)
-        return match.group(1).strip() if match else ""
+        return ""
 
     @staticmethod
-    def _extract_taxonomy(html: str) -> set:
-        """Extract product taxonomy from HTML classes."""
+    def _extract_taxonomy(tree) -> set:
+        """Extract product taxonomy from product-details classes."""
         taxonomy = set()
-        match = re.search(r'<div[^>]+class="product-details[^"]*"[^>]*>', html, re.I)
-        if not match:
+        if tree is None:
             return taxonomy
 
-        classes = re.findall(r'class="([^"]+)"', match.group(0), re.I)
-        cls = " ".join(classes)
+        classes = tree.xpath(_PRODUCT_DETAILS_CLASS_XPATH)
+        if not classes:
+            return taxonomy
 
-        for slug in re.findall(r'product_cat-([a-z0-9\-]+)', cls, re.I):
+        for slug in _RE_PRODUCT_CAT.findall(classes[0]):
             s = slug.lower()
             taxonomy.add(s)
             if "cat" in s:
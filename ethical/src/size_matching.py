@@ -5,7 +5,8 @@ Handles measurement extraction and fuzzy size matching.
 """
 
 import re
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
 # Unit family mappings (unit -> (base_unit, multiplier))
 UNIT_FAMILY_MAP = {
@@ -19,6 +20,17 @@ UNIT_FAMILY_MAP = {
 }
 
 
+# Smart double quotes -> ASCII inch mark
+_QUOTE_TRANS = str.maketrans({"\u201c": '"', "\u201d": '"'})
+
+# Number followed by an inch mark (group 2) or a unit word (group 3)
+_SIZE_RE = re.compile(r'(?<!\d)(\d+(?:\.\d+)?)\s*(?:(")|([A-Z]+)\b)')
+_INCH_UNITS = frozenset({"IN", "INCH", "INCHES"})
+
+# Titles/descriptions repeat across a batch; cache their parsed sizes
+_CACHE_SIZE = 8192
+
+
 def extract_sizes(text: str) -> Dict[str, List[float]]:
     """
     Extract all size measurements from text.
@@ -31,26 +43,29 @@ def extract_sizes(text: str) -> Dict[str, List[float]]:
     Returns:
         Dictionary mapping unit family to list of values
     """
-    families: Dict[str, List[float]] = {}
     if not text:
-        return families
+        return {}
+    return {family: list(values) for family, values in _extract_sizes_cached(text)}
 
-    s = " " + text.upper().replace(""", '"').replace(""", '"') + " "
 
-    # Extract inches with various formats
-    for match in re.finditer(r'(?<!\d)(\d+(?:\.\d+)?)\s*(?:\"|INCH(?:ES)?|IN)\b', s, re.I):
-        families.setdefault("IN", []).append(float(match.group(1)))
+@lru_cache(maxsize=_CACHE_SIZE)
+def _extract_sizes_cached(text: str) -> Tuple[Tuple[str, Tuple[float, ...]], ...]:
+    """Cached, immutable form of extract_sizes (family, values) pairs."""
+    families: Dict[str, List[float]] = {}
+    s = text.upper().translate(_QUOTE_TRANS)
 
-    # Extract other units
-    for match in re.finditer(r'(?<!\d)(\d+(?:\.\d+)?)\s*([A-Z]+)\b', s):
+    # Single pass: each number followed by an inch mark or a unit word
+    for match in _SIZE_RE.finditer(s):
         value = float(match.group(1))
-        unit = match.group(2).upper()
+        unit = match.group(3)
 
-        if unit in UNIT_FAMILY_MAP:
+        if match.group(2) or unit in _INCH_UNITS:
+            families.setdefault("IN", []).append(value)
+        elif unit in UNIT_FAMILY_MAP:
             base, mult = UNIT_FAMILY_MAP[unit]
             families.setdefault(base, []).append(value * mult)
 
-    return families
+    return tuple((family, tuple(values)) for family, values in families.items())
 
 
 def sizes_match(
@@ -77,17 +92,12 @@ def sizes_match(
         if not query_vals:
             continue
 
-        # Check if any pair matches within tolerance
-        matched = False
-        for pval in product_vals:
-            for qval in query_vals:
-                if pval and abs(pval - qval) / pval <= tolerance_ratio:
-                    matched = True
-                    break
-            if matched:
-                break
-
-        if not matched:
+        # Any pair within tolerance (multiply instead of divide; sizes are >= 0)
+        if not any(
+            abs(pval - qval) <= tolerance_ratio * pval
+            for pval in product_vals if pval
+            for qval in query_vals
+        ):
             return False
 
     return True
@@ -5,17 +5,37 @@ Provides product name normalization and matching logic.
 """
 
 import re
-from typing import Dict, List, Set
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple, Pattern
+
+try:
+    import ahocorasick  # type: ignore
+    _HAS_AHOCORASICK = True
+except Exception:
+    _HAS_AHOCORASICK = False
 
 # Regex patterns
-_WS = re.compile(r"\s+")
-_NON_ALNUM = re.compile(r"[^A-Za-z0-9]+")
 _MFR_WORDS = re.compile(r"\b(?:ETHICAL(?:\s+PRODUCTS?)?|SPOT)\b", re.I)
 _QTY_WORDS = re.compile(r"\b(?:COUNT|CT|PACK|PK|BULK|ASSTD|ASST|ASSORTED|EACH|EA|SET|BX|BOX|PDQ|DISPLAY|CASE)\b", re.I)
 _SIZE_WORDS = re.compile(r"\b(?:OZ|OUNCES?|LB|LBS?|POUNDS?|G|GRAMS?|KG|MLS?|ML|L|LITERS?|QT|QTS?|QUARTS?|GALS?|GAL|IN|INCH(?:ES)?)\b", re.I)
+_STOP_WORDS = re.compile(r"\b(?:WITH|W/|W|AND|&|THE|FOR|OF|TO|PLUS|EXTRA|NEW|OR)\b", re.I)
+# Quantity, size and stop words stripped together in one pass
+_DROP_WORDS = re.compile(
+    "|".join(p.pattern for p in (_QTY_WORDS, _SIZE_WORDS, _STOP_WORDS)), re.I
+)
+# Punctuation (including smart quotes) that separates name tokens
+_PUNCT_TO_SPACE = str.maketrans(dict.fromkeys('/"()+,\u201c\u201d\u2018\u2019', " "))
 _CAT_HINT = re.compile(r"\b(?:CAT|KITTY|KITTEN|LITTER)\b", re.I)
 _DOG_HINT = re.compile(r"\b(?:DOG|PUP|PUPPY|CANINE)\b", re.I)
 _DISH_HINT = re.compile(r"\b(?:BOWL|DISH|FEEDER|STONEWARE|CERAMIC)\b", re.I)
+_CAT_BRAND_HINT = r"\bSKINNEEEZ|SKINEEZ|SILVER\s*VINE|KITTY|CATNIP|TEASER|LITTER|FEATHER|FELT\b"
+_DOG_BRAND_HINT = r"\bPLAY\s*STRONG|BAMBONE|BARRETT\b"
+
+# Memoization: query strings and candidate titles repeat heavily across a
+# batch. Inputs longer than _CACHE_MAX_LEN (e.g. whole PDP HTML) bypass the
+# caches so they never pin pages in memory.
+_CACHE_SIZE = 8192
+_CACHE_MAX_LEN = 1024
 
 # Canonical mappings
 FLAVOR_CANON = {
@@ -38,6 +58,213 @@ FORM_TOKENS = {
 }
 
 
+def _token(alias: str, word_chars: str) -> str:
+    """
+    Build a whole-token pattern for an alias.
+
+    The boundary lookbehind sits after the first literal so the combined
+    alternation still starts every branch with a literal character, which
+    lets the regex engine skip ahead on a first-character scan.
+    """
+    return (
+        re.escape(alias[0])
+        + f"(?<!{word_chars}.)"
+        + re.escape(alias[1:])
+        + f"(?!{word_chars})"
+    )
+
+
+def _compile_canon(
+    canon_map: Dict[str, Set[str]],
+    word_chars: str,
+    prep,
+) -> Tuple[Pattern, Dict[str, str]]:
+    """
+    Compile a canonical map into one alternation with a named group per entry.
+
+    Each group matches the canonical name as a substring or any alias as a
+    whole token. Aliases are normalized with the same ``prep`` applied to the
+    scanned text; aliases that already contain the canonical name are dropped
+    since the substring branch covers them.
+
+    Args:
+        canon_map: Canonical name -> alias set
+        word_chars: Character class of token characters
+        prep: Normalizer applied to aliases (and to text at scan time)
+
+    Returns:
+        Tuple of (compiled pattern, group name -> canonical name)
+    """
+    branches = []
+    groups: Dict[str, str] = {}
+    for i, (canon, alts) in enumerate(canon_map.items()):
+        name = f"C{i}"
+        groups[name] = canon
+        aliases = sorted({prep(a) for a in alts if a} - {""}, key=len, reverse=True)
+        parts = [re.escape(canon)] + [
+            _token(a, word_chars) for a in aliases if canon not in a
+        ]
+        branches.append(f"(?P<{name}>{'|'.join(parts)})")
+    return re.compile("|".join(branches)), groups
+
+
+def _upper(s: str) -> str:
+    """Upper-case text, skipping the copy when it already is (e.g. normalized names)."""
+    return s if s.isupper() else s.upper()
+
+
+def _flavor_prep(s: str) -> str:
+    """Normalize text the way flavor matching expects it."""
+    return _upper(s).replace("-", " ").replace("_", " ")
+
+
+def _line_prep(s: str) -> str:
+    """Normalize text the way product-line matching expects it."""
+    return _upper(s).replace("-", "")
+
+
+def _build_automaton(canon_map: Dict[str, Set[str]], prep) -> Optional[Any]:
+    """
+    Build an Aho-Corasick automaton equivalent to ``_compile_canon``.
+
+    Each key maps to ``(length, ((canonical, whole_token), ...))`` so one
+    walk over the text reports substring and whole-token hits alike; token
+    boundaries are checked at the hit.
+
+    Args:
+        canon_map: Canonical name -> alias set
+        prep: Normalizer applied to aliases (and to text at scan time)
+
+    Returns:
+        Finalized automaton, or None when pyahocorasick is not installed
+    """
+    if not _HAS_AHOCORASICK:
+        return None
+    entries: Dict[str, List[Tuple[str, bool]]] = {}
+    for canon, alts in canon_map.items():
+        entries.setdefault(canon, []).append((canon, False))
+        for alias in {prep(a) for a in alts if a} - {""}:
+            if canon not in alias:
+                entries.setdefault(alias, []).append((canon, True))
+    automaton = ahocorasick.Automaton()
+    for word, hits in entries.items():
+        automaton.add_word(word, (len(word), tuple(hits)))
+    automaton.make_automaton()
+    return automaton
+
+
+def _is_alnum(ch: str) -> bool:
+    """Token character test for flavor text (upper-cased ASCII alnum)."""
+    return ch.isascii() and ch.isalnum()
+
+
+def _is_nonspace(ch: str) -> bool:
+    """Token character test for product-line text."""
+    return not ch.isspace()
+
+
+_FLAVOR_RE, _FLAVOR_GROUPS = _compile_canon(FLAVOR_CANON, "[A-Z0-9]", _flavor_prep)
+_LINE_RE, _LINE_GROUPS = _compile_canon(LINE_CANON, r"\S", _line_prep)
+_FLAVOR_AC = _build_automaton(FLAVOR_CANON, _flavor_prep)
+_LINE_AC = _build_automaton(LINE_CANON, _line_prep)
+_FORM_RE = re.compile(
+    "|".join(_token(t, r"\S") for t in sorted(FORM_TOKENS, key=len, reverse=True))
+)
+
+# Taxonomy hints in priority order, fused into one scan
+_TAXONOMY_ORDER = (
+    ("DISH", "dish"),
+    ("CAT", "cat"),
+    ("DOG", "dog"),
+    ("CATB", "cat"),
+    ("DOGB", "dog"),
+)
+_TAXONOMY_RE = re.compile(
+    "|".join(
+        f"(?P<{name}>{pattern})"
+        for name, pattern in (
+            ("DISH", _DISH_HINT.pattern),
+            ("CAT", _CAT_HINT.pattern),
+            ("DOG", _DOG_HINT.pattern),
+            ("CATB", _CAT_BRAND_HINT),
+            ("DOGB", _DOG_BRAND_HINT),
+        )
+    ),
+    re.I,
+)
+
+
+def _scan_canon(pattern: Pattern, groups: Dict[str, str], text: str) -> Set[str]:
+    """Collect canonical names hit by a combined pattern, stopping once all are seen."""
+    found: Set[str] = set()
+    total = len(groups)
+    for m in pattern.finditer(text):
+        found.add(m.lastgroup)
+        if len(found) == total:
+            break
+    return {groups[g] for g in found}
+
+
+def _scan_automaton(
+    automaton: Any,
+    is_word_char: Callable[[str], bool],
+    total: int,
+    text: str,
+) -> Set[str]:
+    """Collect canonical names from one automaton walk, stopping once all are seen."""
+    found: Set[str] = set()
+    last = len(text) - 1
+    for end, (length, hits) in automaton.iter(text):
+        start = end - length + 1
+        for canon, whole_token in hits:
+            if canon in found:
+                continue
+            if whole_token and (
+                (start > 0 and is_word_char(text[start - 1]))
+                or (end < last and is_word_char(text[end + 1]))
+            ):
+                continue
+            found.add(canon)
+        if len(found) == total:
+            break
+    return found
+
+
+def _memo_set(cached: Callable[[str], FrozenSet[str]], text: str) -> Set[str]:
+    """Call a cached frozenset producer, bypassing the cache for long inputs."""
+    if len(text) > _CACHE_MAX_LEN:
+        return set(cached.__wrapped__(text))
+    return set(cached(text))
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _flavors(text: str) -> FrozenSet[str]:
+    """Cached flavor scan backing extract_canonical_flavors."""
+    u = _flavor_prep(text)
+    if _FLAVOR_AC is not None:
+        return frozenset(_scan_automaton(_FLAVOR_AC, _is_alnum, len(FLAVOR_CANON), u))
+    return frozenset(_scan_canon(_FLAVOR_RE, _FLAVOR_GROUPS, u))
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _lines(text: str) -> FrozenSet[str]:
+    """Cached product-line scan backing extract_canonical_line."""
+    u = _line_prep(text)
+    if _LINE_AC is not None:
+        return frozenset(_scan_automaton(_LINE_AC, _is_nonspace, len(LINE_CANON), u))
+    return frozenset(_scan_canon(_LINE_RE, _LINE_GROUPS, u))
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _forms(text: str) -> FrozenSet[str]:
+    """Cached form-token scan backing extract_form_tokens."""
+    toks = set(_FORM_RE.findall(_upper(text)))
+    if "XBONE" in toks:
+        toks.add("X-BONE")
+    return frozenset(toks)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
 def normalize_name(raw: str) -> str:
     """
     Normalize product name for matching.
@@ -50,27 +277,18 @@ def normalize_name(raw: str) -> str:
     Returns:
         Normalized name in uppercase
     """
-    s = _WS.sub(" ", raw.strip())
-    s = _MFR_WORDS.sub(" ", s)
-    s = s.replace("-", "")
-    s = _QTY_WORDS.sub(" ", s)
-    s = _SIZE_WORDS.sub(" ", s)
-    s = re.sub(
-        r'\b(?:WITH|W/|W|AND|&|THE|FOR|OF|TO|PLUS|EXTRA|NEW|OR)\b',
-        " ",
-        s,
-        flags=re.I
-    )
-    s = re.sub(r'[/"""''()+,]', " ", s)
-    s = _WS.sub(" ", s).strip().upper()
+    s = _MFR_WORDS.sub(" ", raw).replace("-", "")
+    s = _DROP_WORDS.sub(" ", s).translate(_PUNCT_TO_SPACE)
 
-    parts = s.split()
+    # split() collapses and trims whitespace in the same step
+    parts = s.upper().split()
     if parts:
         parts[0] = singularize_simple(parts[0])
 
     return " ".join(parts)
 
 
+@lru_cache(maxsize=_CACHE_SIZE)
 def singularize_simple(tok: str) -> str:
     """
     Simple singularization of token.
@@ -98,15 +316,7 @@ def extract_canonical_flavors(text: str) -> Set[str]:
     Returns:
         Set of canonical flavor names
     """
-    u = (text or "").upper().replace("-", " ").replace("_", " ")
-    toks = set(_NON_ALNUM.split(u))
-    out = set()
-
-    for canon, alts in FLAVOR_CANON.items():
-        if canon in u or alts.intersection(toks):
-            out.add(canon)
-
-    return out
+    return _memo_set(_flavors, text or "")
 
 
 def extract_canonical_line(text: str) -> Set[str]:
@@ -119,15 +329,7 @@ def extract_canonical_line(text: str) -> Set[str]:
     Returns:
         Set of canonical line names
     """
-    u = (text or "").upper().replace("-", "")
-    toks = set(text.split())
-    out = set()
-
-    for canon, alts in LINE_CANON.items():
-        if canon in u or alts.intersection(toks):
-            out.add(canon)
-
-    return out
+    return _memo_set(_lines, text or "")
 
 
 def extract_form_tokens(text: str) -> Set[str]:
@@ -140,12 +342,10 @@ def extract_form_tokens(text: str) -> Set[str]:
     Returns:
         Set of form tokens found
     """
-    toks = set(text.upper().split())
-    if "XBONE" in toks:
-        toks.add("X-BONE")
-    return {t for t in toks if t in FORM_TOKENS}
+    return _memo_set(_forms, text)
 
 
+@lru_cache(maxsize=_CACHE_SIZE)
 def infer_taxonomy(text: str) -> str:
     """
     Infer product taxonomy (cat/dog/dish) from text.
@@ -156,21 +356,15 @@ def infer_taxonomy(text: str) -> str:
     Returns:
         Taxonomy hint: "cat", "dog", "dish", or ""
     """
-    if _DISH_HINT.search(text):
-        return "dish"
-    if _CAT_HINT.search(text):
-        return "cat"
-    if _DOG_HINT.search(text):
-        return "dog"
-
-    # Brand-specific clues
-    if re.search(
-        r"\bSKINNEEEZ|SKINEEZ|SILVER\s*VINE|KITTY|CATNIP|TEASER|LITTER|FEATHER|FELT\b",
-        text,
-        re.I
-    ):
-        return "cat"
-    if re.search(r"\bPLAY\s*STRONG|BAMBONE|BARRETT\b", text, re.I):
-        return "dog"
+    hits = set()
+    for m in _TAXONOMY_RE.finditer(text):
+        if m.lastgroup == "DISH":
+            return "dish"
+        hits.add(m.lastgroup)
+
+    # Generic hints win over brand-specific clues
+    for name, taxonomy in _TAXONOMY_ORDER:
+        if name in hits:
+            return taxonomy
 
     return ""
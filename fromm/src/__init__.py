@@ -1,5 +1,13 @@
 """Fromm Family Foods Product Collector."""
 
-collector import FrommCollector, SITE_CONFIG
+import os
+import sys
+
+# Make the repo-level ``shared`` package importable, once for every module
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from .collector import FrommCollector, SITE_CONFIG
 
 __all__ = ["FrommCollector", "SITE_CONFIG"]
@@ -5,20 +5,15 @@ Fromm Family Foods Product Collector
 Collects product data from https://frommfamily.com.
 """
 
-import os
-import sys
-from typing import Dict, Any, Callable
+from types import MappingProxyType
+from typing import Dict, Any, Callable, List
 
-# Add parent directory to path for shared imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
-
-from shared.src import load_json_file, save_json_file
 from src.search import FrommSearcher
 from src.parser import FrommParser
 
 
-# Site Configuration (embedded from profile)
-SITE_CONFIG = {
+# Site Configuration (embedded from profile); read-only module default
+SITE_CONFIG = MappingProxyType({
     "key": "fromm",
     "display_name": "Fromm Family Foods",
     "origin": "https://frommfamily.com",
@@ -32,7 +27,7 @@ SITE_CONFIG = {
             "072705115204": "https://frommfamily.com/products/dog/gold/dry/adult-gold/"
         }
     }
-}
+})
 
 
 class FrommCollector:
@@ -82,6 +77,18 @@ class FrommCollector:
         """
         return self.parser.parse_page(html_text)
 
+    def parse_pages(self, html_texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Parse many product page HTMLs in one batch.
+
+        Args:
+            html_texts: HTML content of each product page
+
+        Returns:
+            One product data dictionary per page, in input order
+        """
+        return self.parser.parse_pages(html_texts)
+
 
 def main():
     """CLI entry point."""
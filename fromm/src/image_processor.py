@@ -5,18 +5,43 @@ Handles Fromm-specific image extraction from carousel.
 """
 
 import re
-from typing import List
+from bisect import bisect_right
+from typing import Iterable, List
 from urllib.parse import urlsplit, urlunsplit
-import os
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
-from shared.src import deduplicate_urls
+from shared.src import deduplicate_urls, compile_linear
+
+
+# Only gallery images served from the Fromm media CDN are kept
+_CDN_MEDIA = "cdn.frommfamily.com/media/"
+
+# #mainCarousel is located once; one slide pattern then runs over the
+# carousel only, taking each slide's data-src or, failing that, the src
+# of its <img>. The carousel ends at the next carousel container (e.g.
+# #thumbCarousel or a related-products carousel), capped at
+# _CAROUSEL_MAX characters when no such marker follows.
+_CAROUSEL_MARKER = 'id="mainCarousel"'
+_RE_CAROUSEL_END = compile_linear(
+    r'\sid="[^"]*carousel"|\sclass="(?:[^"\s]+\s+)*carousel[\s"]',
+    re.I
+)
+_CAROUSEL_MAX = 200_000
+_RE_CAROUSEL_SLIDE = compile_linear(
+    r'<div[^>]*class="carousel__slide"[^>]*\sdata-src="([^"]+)"'
+    r'|<div[^>]*class="carousel__slide"[\s\S]*?<img[^>]*\ssrc="([^"]+)"',
+    re.I
+)
+
+# Joins carousels for a batch scan; contains no "<" so no slide can start in it
+_PAGE_SEP = "\x01\x02PAGE\x02\x01"
 
 
 class FrommImageProcessor:
     """Handles Fromm Family Foods image processing."""
 
+    # Static/class methods only; no per-instance state
+    __slots__ = ()
+
     @staticmethod
     def clean_url(url: str) -> str:
         """
@@ -44,35 +69,67 @@ class FrommImageProcessor:
         Returns:
             List of normalized, deduplicated image URLs
         """
-        media = []
-
-        # Prefer data-src attribute
-        for match in re.finditer(
-            r'id="mainCarousel"[\s\S]*?<div[^>]*class="carousel__slide"[^>]*\sdata-src="([^"]+)"',
-            html_text,
-            flags=re.I
-        ):
-            media.append(match.group(1))
-
-        # Fallback: <img src>
-        for match in re.finditer(
-            r'id="mainCarousel"[\s\S]*?<div[^>]*class="carousel__slide"[\s\S]*?<img[^>]*\ssrc="([^"]+)"',
-            html_text,
-            flags=re.I
-        ):
-            media.append(match.group(1))
-
-        # Filter to Fromm CDN URLs only and normalize
-        out = []
-        seen = set()
-
-        for url in media:
-            if "cdn.frommfamily.com/media/" not in url:
+        return cls._clean_media(cls._slide_urls(cls._carousel(html_text)))
+
+    @classmethod
+    def extract_gallery_images_many(cls, html_texts: List[str]) -> List[List[str]]:
+        """
+        Extract gallery images from many pages with one carousel scan.
+
+        Each page's bounded #mainCarousel region (see _carousel) is joined
+        on a sentinel and scanned once; each slide is routed back to its
+        page by offset. A slide match that runs across
+        a page boundary marks the pages it spans for an individual rescan,
+        so results always equal per-page extract_gallery_images().
+
+        Args:
+            html_texts: HTML content of each page
+
+        Returns:
+            Gallery image URLs per page, in input order
+        """
+        carousels = [cls._carousel(html_text) for html_text in html_texts]
+
+        starts = []
+        pos = 0
+        for carousel in carousels:
+            starts.append(pos)
+            pos += len(carousel) + len(_PAGE_SEP)
+
+        found: List[List[str]] = [[] for _ in carousels]
+        rescan = set()
+        for m in _RE_CAROUSEL_SLIDE.finditer(_PAGE_SEP.join(carousels)):
+            page = bisect_right(starts, m.start()) - 1
+            last = bisect_right(starts, m.end() - 1) - 1
+            if last != page:
+                rescan.update(range(page, last + 1))
                 continue
+            found[page].append(m.group(1) or m.group(2))
+
+        for page in rescan:
+            found[page] = cls._slide_urls(carousels[page])
+        return [cls._clean_media(media) for media in found]
 
-            cleaned = cls.clean_url(url)
-            if cleaned and cleaned not in seen:
-                seen.add(cleaned)
-                out.append(cleaned)
+    @staticmethod
+    def _carousel(html_text: str) -> str:
+        """Return the #mainCarousel region of the page ("" if absent)."""
+        start = html_text.find(_CAROUSEL_MARKER)
+        if start < 0:
+            return ""
+        carousel = html_text[start:start + _CAROUSEL_MAX]
+        # Look for the next carousel after the #mainCarousel opening tag
+        end = _RE_CAROUSEL_END.search(carousel, carousel.find(">") + 1)
+        return carousel[:end.start()] if end else carousel
 
-        return out
+    @staticmethod
+    def _slide_urls(carousel: str) -> List[str]:
+        """Return each slide's data-src, falling back to its <img src>."""
+        return [m.group(1) or m.group(2) for m in _RE_CAROUSEL_SLIDE.finditer(carousel)]
+
+    @classmethod
+    def _clean_media(cls, media: Iterable[str]) -> List[str]:
+        """Keep Fromm CDN URLs, normalized and deduplicated in order."""
+        # dict.fromkeys deduplicates while keeping first-seen order
+        cleaned = dict.fromkeys(cls.clean_url(url) for url in media if _CDN_MEDIA in url)
+        cleaned.pop("", None)
+        return list(cleaned)
@@ -6,20 +6,44 @@ Extracts product data from HTML pages.
 
 import re
 from typing import Dict, Any, List
-import os
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
 from shared.src import text_only
 from src.image_processor import FrommImageProcessor
 
 
+# Section start markers, located together in one left-to-right scan
+_RE_SECTIONS = re.compile(
+    r'(?P<name><h1)'
+    r'|(?P<lead><div class="lead">)'
+    r'|<h3>(?:(?P<ingredients>Ingredients)'
+    r'|(?P<ga>Guaranteed Analysis)'
+    r'|(?P<caloric>Caloric Content)'
+    r'|(?P<sizes>Available Sizes))</h3>'
+    r'|(?P<crumbs><p class="breadcrumbs)',
+    re.I
+)
+_SECTION_NAMES = tuple(_RE_SECTIONS.groupindex)
+
+# Section captures, each run from its section's offset
+_RE_NAME = re.compile(r"<h1[^>]*>(.*?)</h1>", re.I | re.DOTALL)
+_RE_DESC_LEAD = re.compile(r'<div class="lead">\s*<p>(.*?)</p>', re.I | re.DOTALL)
+_RE_DESC_AFTER_H1 = re.compile(r"</h1>\s*<p[^>]*>(.*?)</p>", re.I | re.DOTALL)
+_RE_INGREDIENTS = re.compile(r"<h3>Ingredients</h3>(.*?)</div>", re.I | re.DOTALL)
+_RE_GA = re.compile(r"<h3>Guaranteed Analysis</h3>(.*?)</ul>", re.I | re.DOTALL)
+_RE_CALORIC = re.compile(r"<h3>Caloric Content</h3>(.*?)</section>", re.I | re.DOTALL)
+_RE_SIZES = re.compile(r"<h3>Available Sizes</h3>\s*<p>(.*?)</p>", re.I)
+_RE_CRUMBS = re.compile(r'<p class="breadcrumbs.*?">\s*(.*?)</p>', re.I | re.DOTALL)
+
+# Post-processing patterns
+_RE_CRUMB_LINK = re.compile(r'>([^<]+)</a>')
+_RE_COMMA_FIX = re.compile(r",(?=\S)")
+_RE_UPC_DIGITS = re.compile(r"\d{12,13}")
+
+
 class FrommParser:
     """Parses Fromm Family Foods product pages."""
 
-    def __init__(self):
-        """Initialize parser."""
-        self.image_processor = FrommImageProcessor()
+    __slots__ = ()
 
     def parse_page(self, html_text: str) -> Dict[str, Any]:
         """
@@ -43,118 +67,146 @@ class FrommParser:
             - key: Product key
             - variants: List of UPC variants if multiple found
         """
-        data = {}
+        return self._build(html_text, FrommImageProcessor.extract_gallery_images(html_text))
+
+    def parse_pages(self, html_texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Extract product information from many pages at once.
+
+        Gallery carousels are scanned in a single regex pass over all
+        pages; results match calling parse_page() on each page.
+
+        Args:
+            html_texts: HTML content of each product page
+
+        Returns:
+            One product data dictionary per page, in input order
+        """
+        galleries = FrommImageProcessor.extract_gallery_images_many(html_texts)
+        return [self._build(html_text, media) for html_text, media in zip(html_texts, galleries)]
+
+    def _build(self, html_text: str, media: List[str]) -> Dict[str, Any]:
+        """
+        Build product data from page HTML and its gallery images.
+
+        Args:
+            html_text: HTML content of product page
+            media: Gallery image URLs extracted from the page
+
+        Returns:
+            Product data dictionary (see parse_page)
+        """
+        offsets = self._locate_sections(html_text)
+
+        def section(pattern, key: str):
+            # A capture can only start at its marker, so searching from the
+            # first marker offset finds the same match as a full-page search
+            pos = offsets.get(key)
+            return pattern.search(html_text, pos) if pos is not None else None
 
         # Product name
-        name_match = re.search(r"<h1[^>]*>(.*?)</h1>", html_text, flags=re.I | re.DOTALL)
-        data["name"] = text_only(name_match.group(1)) if name_match else ""
+        name_match = section(_RE_NAME, "name")
+        name = text_only(name_match.group(1)) if name_match else ""
 
         # Description (primary lead block, with fallback just after H1)
         desc_html = ""
-        desc_match = re.search(
-            r'<div class="lead">\s*<p>(.*?)</p>',
-            html_text,
-            flags=re.I | re.DOTALL
-        )
+        desc_match = section(_RE_DESC_LEAD, "lead")
         if desc_match:
             desc_html = desc_match.group(1)
         else:
-            desc_match2 = re.search(
-                r"</h1>\s*<p[^>]*>(.*?)</p>",
-                html_text,
-                flags=re.I | re.DOTALL
-            )
+            desc_match2 = section(_RE_DESC_AFTER_H1, "name")
             desc_html = desc_match2.group(1) if desc_match2 else ""
-        data["description"] = text_only(desc_html)
+        description = text_only(desc_html)
 
         # Ingredients
-        ing_match = re.search(
-            r"<h3>Ingredients</h3>(.*?)</div>",
-            html_text,
-            flags=re.I | re.DOTALL
-        )
+        ing_match = section(_RE_INGREDIENTS, "ingredients")
         ingredients = text_only(ing_match.group(1)) if ing_match else ""
         # Add spacing after commas
-        ingredients = re.sub(r",(?=\S)", ", ", ingredients)
-        data["ingredients"] = ingredients
+        ingredients = _RE_COMMA_FIX.sub(", ", ingredients)
 
         # Nutrition (Guaranteed Analysis + Caloric Content)
         nutrition_parts = []
-        ga_match = re.search(
-            r"<h3>Guaranteed Analysis</h3>(.*?)</ul>",
-            html_text,
-            flags=re.I | re.DOTALL
-        )
+        ga_match = section(_RE_GA, "ga")
         if ga_match:
             nutrition_parts.append(text_only(ga_match.group(1)))
 
-        cal_match = re.search(
-            r"<h3>Caloric Content</h3>(.*?)</section>",
-            html_text,
-            flags=re.I | re.DOTALL
-        )
+        cal_match = section(_RE_CALORIC, "caloric")
         if cal_match:
             nutrition_parts.append("Caloric Content: " + text_only(cal_match.group(1)))
 
-        data["nutrition"] = "\n".join(p for p in nutrition_parts if p)
+        nutrition = "\n".join(p for p in nutrition_parts if p)
 
         # Sizes (trim trailing period + collapse whitespace)
-        sizes_match = re.search(
-            r"<h3>Available Sizes</h3>\s*<p>(.*?)</p>",
-            html_text,
-            flags=re.I
-        )
+        size_info = ""
+        sizes_match = section(_RE_SIZES, "sizes")
         if sizes_match:
             sizes = sizes_match.group(1).strip()
             if sizes.endswith("."):
                 sizes = sizes[:-1]
-            data["size_info"] = re.sub(r"\s+", " ", sizes)
-        else:
-            data["size_info"] = ""
+            size_info = " ".join(sizes.split())
 
         # Breadcrumbs (normalize whitespace per crumb)
-        crumbs = re.findall(
-            r'<p class="breadcrumbs.*?">\s*(.*?)</p>',
-            html_text,
-            flags=re.I | re.DOTALL
-        )
+        crumbs_match = section(_RE_CRUMBS, "crumbs")
         breadcrumb_list = []
-        if crumbs:
-            breadcrumb_list = re.findall(r'>([^<]+)</a>', crumbs[0])
-        data["breadcrumbs"] = [re.sub(r"\s+", " ", c).strip() for c in breadcrumb_list]
-
-        # Manufacturer info
-        data["manufacturer_key"] = "FROMM-FAMILY-FOODS"
-        data["mpn"] = ""
+        if crumbs_match:
+            breadcrumb_list = _RE_CRUMB_LINK.findall(crumbs_match.group(1))
+        breadcrumbs = [" ".join(c.split()) for c in breadcrumb_list]
 
-        # Images (gallery only)
-        data["media"] = self.image_processor.extract_gallery_images(html_text)
-
-        # UPCs (derived from image filenames)
+        # UPCs (derived from image filenames); URLs are scanned in one pass,
+        # joined on a non-digit so runs never span two URLs
         upcs_found = set()
-        for url in data["media"]:
-            digits = re.findall(r"(\d{12,13})", url)
-            for d in digits:
-                # Normalize 13-digit to 12-digit if starts with 0
-                if len(d) == 13 and d.startswith("0"):
-                    d = d[1:]
-                if len(d) == 12:
-                    upcs_found.add(d)
+        for d in _RE_UPC_DIGITS.findall("\x1f".join(media)):
+            # Normalize 13-digit to 12-digit if starts with 0
+            if len(d) == 13 and d.startswith("0"):
+                d = d[1:]
+            if len(d) == 12:
+                upcs_found.add(d)
 
         upc_list = sorted(upcs_found)
 
+        # Built in one literal, keys in output order
+        data = {
+            "name": name,
+            "description": description,
+            "ingredients": ingredients,
+            "nutrition": nutrition,
+            "size_info": size_info,
+            "breadcrumbs": breadcrumbs,
+            "manufacturer_key": "FROMM-FAMILY-FOODS",
+            "mpn": "",
+            "media": media,
+        }
+
         # Single UPC vs multiple variants
         if len(upc_list) == 1:
             data["upc"] = upc_list[0]
             data["key"] = f"FROMM-FAMILY-FOODS-{upc_list[0]}"
         else:
             data["upc"] = None
-            base_key = (
-                f"FROMM-FAMILY-FOODS-{data['name'].upper().replace(' ', '-')}"
-                if data.get("name")
+            data["key"] = (
+                f"FROMM-FAMILY-FOODS-{name.upper().replace(' ', '-')}"
+                if name
                 else "FROMM-FAMILY-FOODS-PRODUCT"
             )
-            data["key"] = base_key
             data["variants"] = [{"upc": u} for u in upc_list]
 
         return data
+
+    @staticmethod
+    def _locate_sections(html_text: str) -> Dict[str, int]:
+        """
+        Find the first offset of every section marker in one pass.
+
+        Args:
+            html_text: HTML content of product page
+
+        Returns:
+            Section name -> offset of its first marker (missing if absent)
+        """
+        offsets: Dict[str, int] = {}
+        total = len(_SECTION_NAMES)
+        for match in _RE_SECTIONS.finditer(html_text):
+            offsets.setdefault(match.lastgroup, match.start())
+            if len(offsets) == total:
+                break
+        return offsets
@@ -4,10 +4,8 @@ Search functionality for Fromm Family Foods collector.
 Handles UPC overrides for product lookup.
 """
 
+from types import MappingProxyType
 from typing import Dict, Any, Callable
-import os
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
 from shared.src import normalize_upc
 
@@ -15,6 +13,8 @@ from shared.src import normalize_upc
 class FrommSearcher:
     """Handles product search for Fromm Family Foods."""
 
+    __slots__ = ("upc_overrides",)
+
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize searcher.
@@ -22,8 +22,11 @@ class FrommSearcher:
         Args:
             config: Site configuration
         """
-        search_config = config.get("search", {})
-        self.upc_overrides = search_config.get("upc_overrides", {})
+        search_config = config.get("search") or {}
+        # Frozen once so each lookup is a single mapping get
+        self.upc_overrides = MappingProxyType(
+            dict(search_config.get("upc_overrides") or {})
+        )
 
     def find_product_url(
         self,
@@ -46,7 +49,4 @@ class FrommSearcher:
         Returns:
             Product URL or empty string if not found
         """
-        clean_upc = normalize_upc(upc)
-        if clean_upc in self.upc_overrides:
-            return self.upc_overrides[clean_upc]
-        return ""
+        return self.upc_overrides.get(normalize_upc(upc), "")
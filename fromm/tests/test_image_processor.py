@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test Gallery Image Extraction
+
+Tests that only #mainCarousel slides become gallery images: slides from
+#thumbCarousel and related-product carousels must not leak in, and the
+batch extractor must match per-page extraction.
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.image_processor import FrommImageProcessor
+
+
+CDN = "https://cdn.frommfamily.com/media/"
+
+MAIN = (
+    '<div id="mainCarousel" class="carousel w-10/12 max-w-5xl mx-auto">'
+    f'<div class="carousel__slide" data-src="{CDN}gallery/072705000001.png"></div>'
+    f'<div class="carousel__slide"><img src="{CDN}gallery/bag-back.jpg"></div>'
+    '</div>'
+)
+THUMBS = (
+    '<div id="thumbCarousel" class="carousel max-w-xl mx-auto">'
+    f'<div class="carousel__slide"><img src="{CDN}thumbs/072705000001.png"></div>'
+    '</div>'
+)
+RELATED = (
+    '<section class="related-products"><div class="products carousel">'
+    f'<div class="carousel__slide" data-src="{CDN}related/072705999999.png"></div>'
+    '</div></section>'
+)
+GALLERY = [f"{CDN}gallery/072705000001.png", f"{CDN}gallery/bag-back.jpg"]
+
+
+def test_thumb_and_related_slides_excluded():
+    """Test that slides after #mainCarousel are not gallery images."""
+    html_text = f"<main>{MAIN}{THUMBS}</main><footer>{RELATED}</footer>"
+
+    media = FrommImageProcessor.extract_gallery_images(html_text)
+
+    assert media == GALLERY, f"Expected main carousel only, got {media}"
+    print("✓ Thumbnail and related-product slides excluded")
+
+
+def test_batch_matches_per_page():
+    """Test that the batch extractor equals per-page extraction."""
+    pages = [
+        MAIN + THUMBS + RELATED,
+        MAIN + RELATED,
+        THUMBS + MAIN,
+        RELATED,
+        "",
+    ]
+
+    batch = FrommImageProcessor.extract_gallery_images_many(pages)
+    single = [FrommImageProcessor.extract_gallery_images(page) for page in pages]
+
+    assert batch == single, f"Batch {batch} != per-page {single}"
+    print("✓ Batch extraction matches per-page extraction")
+
+
+if __name__ == "__main__":
+    test_thumb_and_related_slides_excluded()
+    test_batch_matches_per_page()
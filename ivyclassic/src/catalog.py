@@ -5,13 +5,37 @@ Handles loading and looking up products from JSON catalog file.
 """
 
 import json
+import os
 import re
-from typing import Dict, List, Optional, Callable
+import sys
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Callable, Tuple
+
+try:
+    import orjson  # type: ignore
+    _HAS_ORJSON = True
+except Exception:
+    _HAS_ORJSON = False
+
+
+# Digit-only normalization: translate drops every Latin-1 non-digit in C;
+# the regex only runs for the rare input with wider characters left over.
+_KEEP_DIGITS = str.maketrans("", "", "".join(
+    chr(c) for c in range(256) if not 48 <= c <= 57
+))
+_RE_NON_DIGIT = re.compile(r"[^0-9]")
 
 
 class CatalogManager:
     """Manages UPC to URL catalog for Ivyclassic."""
 
+    __slots__ = ("catalog_path", "_catalog", "_by_digits")
+
+    # (abs path, mtime ns, size) -> (catalog, digits index), shared by every
+    # instance so reloading an unchanged file is a dict hit. Both mappings
+    # are frozen once loaded since instances share them.
+    _CATALOG_CACHE: Dict[Tuple[str, int, int], Tuple[Mapping[str, str], Mapping[str, str]]] = {}
+
     def __init__(self, catalog_path: str = ""):
         """
         Initialize catalog manager.
@@ -20,7 +44,9 @@ class CatalogManager:
             catalog_path: Path to catalog JSON file
         """
         self.catalog_path = catalog_path
-        self._catalog: Optional[Dict[str, str]] = None
+        self._catalog: Optional[Mapping[str, str]] = None
+        # Leading-zero-stripped digits -> URL, built at load time
+        self._by_digits: Mapping[str, str] = {}
 
     def set_catalog_path(self, path: Optional[str]) -> None:
         """
@@ -31,56 +57,70 @@ class CatalogManager:
         """
         self.catalog_path = (path or "").strip()
         self._catalog = None  # Force reload
+        self._by_digits = {}
 
-    def _normalize_upc_variants(self, upc: str) -> List[str]:
+    def _normalize_upc_variants(self, upc: str) -> Tuple[str, ...]:
         """
-        Return a list of plausible UPC key forms to try against the catalog.
+        Return the plausible UPC key forms to try against the catalog.
         Keeps only digits and tries 12/13/14-digit padded/sliced + stripped.
 
         Args:
             upc: UPC to normalize
 
         Returns:
-            List of UPC variants to try
+            Tuple of UPC variants to try, in priority order
         """
+        n = self._digits(upc)
+        if not n:
+            return ()
+
+        # Digits padded (or cut from the right) to 12/13/14, then the same
+        # for the leading-zero-stripped form, then the digits as given
+        ln = len(n)
+        forms = (
+            n.zfill(12) if ln <= 12 else n[-12:],
+            n.zfill(13) if ln <= 13 else n[-13:],
+            n.zfill(14) if ln <= 14 else n[-14:],
+        )
+        s = n.lstrip("0")
+        if s:
+            ls = len(s)
+            forms += (
+                s,
+                s.zfill(12) if ls <= 12 else s[-12:],
+                s.zfill(13) if ls <= 13 else s[-13:],
+                s.zfill(14) if ls <= 14 else s[-14:],
+            )
+        return tuple(dict.fromkeys(forms + (n,)))
+
+    @staticmethod
+    def _digits(upc: str) -> str:
+        """Keep only the ASCII digits of a UPC."""
         try:
-            upc_num = re.sub(r"[^0-9]", "", upc or "")
+            digits = (upc or "").translate(_KEEP_DIGITS)
+            if not digits.isascii():
+                digits = _RE_NON_DIGIT.sub("", digits)
+            return digits
         except Exception:
-            upc_num = str(upc or "")
-
-        variants: List[str] = []
-        if not upc_num:
-            return variants
-
-        length = len(upc_num)
-        for target in (12, 13, 14):
-            if length == target:
-                variants.append(upc_num)
-            elif length < target:
-                variants.append(upc_num.zfill(target))
-            else:
-                variants.append(upc_num[-target:])
-
-        stripped = upc_num.lstrip("0")
-        if stripped:
-            if stripped not in variants:
-                variants.append(stripped)
-            for target in (12, 13, 14):
-                cand = stripped.zfill(target) if len(stripped) <= target else stripped[-target:]
-                if cand not in variants:
-                    variants.append(cand)
-
-        if upc_num not in variants:
-            variants.append(upc_num)
-
-        # Deduplicate while preserving order
-        seen = set()
-        out: List[str] = []
-        for v in variants:
-            if v and v not in seen:
-                out.append(v)
-                seen.add(v)
-        return out
+            return str(upc or "")
+
+    def _index_digits(self) -> None:
+        """
+        Index catalog keys by their digits without leading zeros.
+
+        A query whose zero-padded or stripped variant equals a catalog key
+        shares that key's stripped digits, so one dict hit replaces trying
+        every variant. Only keys such a variant can produce are indexed:
+        all-digit keys that are 12-14 digits long or have no leading zeros.
+        The first key loaded wins, as the raw catalog keeps file order.
+        """
+        self._by_digits = {}
+        for key, url in self._catalog.items():
+            if not key.isdigit() or not key.isascii():
+                continue
+            stripped = key.lstrip("0")
+            if stripped and (stripped == key or 12 <= len(key) <= 14):
+                self._by_digits.setdefault(stripped, url)
 
     def _ensure_catalog_loaded(self, log: Callable[[str], None]) -> None:
         """
@@ -97,16 +137,34 @@ class CatalogManager:
             log("[Ivy] No catalog_json_file path set.")
             return
 
+        try:
+            st = os.stat(self.catalog_path)
+            cache_key = (os.path.abspath(self.catalog_path), st.st_mtime_ns, st.st_size)
+        except OSError:
+            cache_key = None
+        cached = self._CATALOG_CACHE.get(cache_key) if cache_key else None
+        if cached is not None:
+            self._catalog, self._by_digits = cached
+            log(f"[Ivy] Catalog unchanged; reusing {len(self._catalog)} loaded entries.")
+            return
+
         log(f"[Ivy] Loading catalog from: {self.catalog_path}")
         try:
-            with open(self.catalog_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            if _HAS_ORJSON:
+                with open(self.catalog_path, "rb") as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(self.catalog_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
 
-            # Accept either a mapping {upc: url, ...} or an array of {upc, url}
+            # Accept either a mapping {upc: url, ...} or an array of {upc, url}.
+            # URLs are interned: size variants often share one PDP URL.
             if isinstance(data, dict):
-                for k, v in data.items():
-                    if v and isinstance(v, str):
-                        self._catalog[str(k).strip()] = v.strip()
+                self._catalog = {
+                    str(k).strip(): sys.intern(v.strip())
+                    for k, v in data.items()
+                    if v and isinstance(v, str)
+                }
             elif isinstance(data, list):
                 for row in data:
                     if not isinstance(row, dict):
@@ -114,10 +172,18 @@ class CatalogManager:
                     k = str(row.get("upc") or "").strip()
                     v = str(row.get("url") or "").strip()
                     if k and v:
-                        self._catalog[k] = v
+                        self._catalog[k] = sys.intern(v)
             else:
                 log(f"[Ivy] Catalog is neither object nor array; ignoring contents.")
 
+            self._index_digits()
+            self._catalog = MappingProxyType(self._catalog)
+            self._by_digits = MappingProxyType(self._by_digits)
+            if cache_key:
+                # Drop entries for older versions of the same file
+                for stale in [k for k in self._CATALOG_CACHE if k[0] == cache_key[0]]:
+                    del self._CATALOG_CACHE[stale]
+                self._CATALOG_CACHE[cache_key] = (self._catalog, self._by_digits)
             log(f"[Ivy] Catalog loaded with {len(self._catalog)} entries.")
         except FileNotFoundError:
             log(f"[Ivy] Catalog file not found: {self.catalog_path}")
@@ -139,8 +205,29 @@ class CatalogManager:
         if not self._catalog:
             return None
 
-        variants = self._normalize_upc_variants(upc)
-        for key in [upc] + variants:
+        url = self._catalog.get(upc)
+        if url:
+            return url
+
+        # Bare-digit UPCs (the common case) skip normalization; the raw
+        # miss above already covers their digits-as-given form
+        if isinstance(upc, str) and upc.isascii() and upc.isdigit():
+            digits = upc
+        else:
+            digits = self._digits(upc)
+            url = self._catalog.get(digits)
+            if url:
+                return url
+
+        # Padded/stripped forms resolve through the load-time index
+        url = self._by_digits.get(digits.lstrip("0"))
+        if url:
+            return url
+        if len(digits) <= 12:
+            return None
+
+        # Longer codes may still match a catalog key by their trailing digits
+        for key in self._normalize_upc_variants(upc):
             url = self._catalog.get(key)
             if url:
                 return url
@@ -5,13 +5,88 @@ Extracts product data from HTML pages.
 """
 
 import re
+from functools import lru_cache
 from typing import Dict, Any, List
-from bs4 import BeautifulSoup
+from urllib.parse import urlsplit, urlunsplit
+from lxml import html as lxml_html
+
+
+# Features pane id used when no tab button points at it
+_RE_TAB_PANE = re.compile(r"item_swiftrizzo_tabs_\d+_1")
+# Labels of spec table rows mixed into the features list (lowercase)
+_SPEC_LABELS = ("product no.", "upc code", "box qty", "case qty", "weight")
+# Stock-status badges rendered as <img>, matched on lowercased alt text
+_STATUS_ALTS = frozenset({"in stock", "on backorder"})
+
+# Pages are queried by XPath only, so skip libxml2's id table; never
+# fetch external resources while parsing
+_HTML_PARSER = lxml_html.HTMLParser(collect_ids=False, no_network=True, huge_tree=False)
+
+# Page lookups, run against one parsed lxml tree
+_TITLE_XPATH = "(//h1 | //h2)[1]"
+# Target of the first in-page tab button labelled "Features" (any case;
+# no-break spaces count as whitespace, as with str.strip)
+_FEATURES_TARGET_XPATH = (
+    '(//button[starts-with(@data-bs-target, "#")]'
+    '[translate(normalize-space(translate(., "\u00a0", " ")), "FEATURS", "featurs") = "features"]'
+    ')[1]/@data-bs-target'
+)
+_BY_ID_XPATH = "(//*[@id = $id])[1]"
+_TAB_PANE_XPATH = '//div[contains(@id, "item_swiftrizzo_tabs_")]'
+_IMG_XPATH = "//img[@src]"
+# Visible text nodes (script/style/template bodies are not page text)
+_TEXT_XPATH = ".//text()[not(ancestor::script or ancestor::style or ancestor::template)]"
+
+
+@lru_cache(maxsize=4096)
+def _clean_image_url_cached(src: str, base: str) -> str:
+    """
+    Clean and normalize an image URL against a site base.
+
+    Pages repeat the same thumbnails and shared assets, so results are
+    memoized across parses.
+
+    Args:
+        src: Image source URL
+        base: Site origin without a trailing slash
+
+    Returns:
+        Cleaned image URL
+    """
+    if not src:
+        return ""
+
+    s = src.strip()
+    if s.startswith("//"):
+        s = "https:" + s
+    elif s.startswith("/"):
+        s = base + s
+    elif not s.startswith("http"):
+        s = base + "/" + s.lstrip("/")
+
+    # Handle GetImage.ashx proxy
+    if "GetImage.ashx" in s and "image=" in s:
+        image_qs = s.split("image=", 1)[1]
+        image_path = image_qs.split("&", 1)[0] if "&" in s else image_qs
+        image_path = image_path.replace("+", " ").replace(" ", "%20")
+        if not image_path.startswith("http"):
+            if not image_path.startswith("/"):
+                image_path = "/" + image_path
+            s = base + image_path
+        else:
+            s = image_path
+        return s.replace("http://", "https://")
+
+    # Plain image: force https and drop query/fragment in one split
+    parts = urlsplit(s)
+    return urlunsplit(("https", parts.netloc, parts.path, "", ""))
 
 
 class IvyclassicParser:
     """Parses Ivyclassic product pages."""
 
+    __slots__ = ("origin", "_origin_base")
+
     def __init__(self, origin: str):
         """
         Initialize parser.
@@ -20,45 +95,70 @@ class IvyclassicParser:
             origin: Site origin URL
         """
         self.origin = origin
+        # Prefix for root-relative image paths, computed once per parser
+        self._origin_base = origin.rstrip("/")
 
-    @staticmethod
-    def _clean_image_url(src: str, origin: str) -> str:
+    def _clean_image_url(self, src: str) -> str:
         """
         Clean and normalize image URL.
 
         Args:
             src: Image source URL
-            origin: Site origin URL
 
         Returns:
             Cleaned image URL
         """
-        if not src:
-            return ""
-
-        s = src.strip()
-        if s.startswith("//"):
-            s = "https:" + s
-        elif s.startswith("/"):
-            s = origin.rstrip("/") + s
-        elif not s.startswith("http"):
-            s = origin.rstrip("/") + "/" + s.lstrip("/")
-
-        # Handle GetImage.ashx proxy
-        if "GetImage.ashx" in s and "image=" in s:
-            image_qs = s.split("image=", 1)[1]
-            image_path = image_qs.split("&", 1)[0] if "&" in s else image_qs
-            image_path = image_path.replace("+", " ").replace(" ", "%20")
-            if not image_path.startswith("http"):
-                if not image_path.startswith("/"):
-                    image_path = "/" + image_path
-                s = origin.rstrip("/") + image_path
-            else:
-                s = image_path
-        else:
-            s = s.split("?", 1)[0].split("#", 1)[0]
+        return _clean_image_url_cached(src, self._origin_base)
 
-        return s.replace("http://", "https://")
+    @staticmethod
+    def _parse_tree(html_text: str):
+        """Parse page HTML into an lxml tree (None if empty or unparseable)."""
+        if not html_text or html_text.isspace():
+            return None
+        try:
+            return lxml_html.document_fromstring(html_text, parser=_HTML_PARSER)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _text(node, separator: str = "") -> str:
+        """
+        Join a node's stripped, non-empty text fragments.
+
+        Args:
+            node: lxml element
+            separator: String placed between fragments
+
+        Returns:
+            Element text
+        """
+        parts = (t.strip() for t in node.xpath(_TEXT_XPATH, smart_strings=False))
+        return separator.join(t for t in parts if t)
+
+    @staticmethod
+    def _is_spec_row(text: str) -> bool:
+        """
+        Check whether a features item is a spec table row.
+
+        The item must start with a spec label. A label ending in a word
+        must not run on into a longer word ("Weightless" is a feature).
+
+        Args:
+            text: Features list item text
+
+        Returns:
+            True if the item should be skipped
+        """
+        head = text.lstrip().lower()
+        if not head.startswith(_SPEC_LABELS):
+            return False
+        for label in _SPEC_LABELS:
+            if head.startswith(label):
+                if label.endswith("."):
+                    return True
+                following = head[len(label):len(label) + 1]
+                return not (following.isalnum() or following == "_")
+        return False
 
     def parse_page(self, html_text: str) -> Dict[str, Any]:
         """
@@ -77,71 +177,65 @@ class IvyclassicParser:
         Returns:
             Dictionary with extracted product data
         """
-        soup = BeautifulSoup(html_text or "", "html.parser")
+        tree = self._parse_tree(html_text)
 
         # Extract title
-        h = soup.find(["h2", "h1"])
-        title = (h.get_text(strip=True) if h else "") or ""
-
-        # Extract benefits from "Features" tab only
+        title = ""
         features_container = None
-
-        # Path A: find the Features tab button and follow its data-bs-target
-        btn = None
-        for b in soup.find_all("button"):
-            txt = (b.get_text() or "").strip().lower()
-            if txt == "features":
-                btn = b
-                break
-        if btn:
-            target = btn.get("data-bs-target") or ""
-            if target.startswith("#"):
-                pane = soup.select_one(target)
-                if pane:
-                    features_container = pane
-
-        # Path B (fallback): match a common id pattern
-        if not features_container:
-            features_container = soup.find("div", id=re.compile(r"item_swiftrizzo_tabs_\d+_1"))
+        if tree is not None:
+            h = tree.xpath(_TITLE_XPATH)
+            title = self._text(h[0]) if h else ""
+
+            # Extract benefits from "Features" tab only.
+            # Path A: one XPath finds the Features tab button and returns
+            # its data-bs-target; follow it to the pane.
+            target = tree.xpath(_FEATURES_TARGET_XPATH)
+            if target:
+                pane = tree.xpath(_BY_ID_XPATH, id=target[0][1:])
+                features_container = pane[0] if pane else None
+
+            # Path B (fallback): match a common id pattern
+            if features_container is None:
+                features_container = next(
+                    (d for d in tree.xpath(_TAB_PANE_XPATH) if _RE_TAB_PANE.search(d.get("id"))),
+                    None
+                )
 
         # Extract list items within the features pane
         benefits: List[Dict[str, str]] = []
-        if features_container:
-            ul = features_container.find("ul")
-            if ul:
-                for li in ul.find_all("li"):
-                    text = li.get_text(separator=" ", strip=True)
+        if features_container is not None:
+            ul = features_container.find(".//ul")
+            if ul is not None:
+                for li in ul.iter("li"):
+                    text = self._text(li, " ")
                     if not text:
                         continue
                     # Skip spec table rows
-                    if re.search(
-                        r"^\s*(Product No\.|UPC Code|Box Qty|Case Qty|Weight)\b",
-                        text,
-                        re.I
-                    ):
+                    if self._is_spec_row(text):
                         continue
                     benefits.append({"title": "", "description": text})
 
         # Extract gallery images
-        gallery_images: List[str] = []
-        for img in soup.find_all("img"):
+        # Image URLs in first-seen order (dict keys keep insertion order)
+        gallery_images: Dict[str, None] = {}
+        for img in (tree.xpath(_IMG_XPATH) if tree is not None else ()):
             src = (img.get("src") or "").strip()
-            if not src:
+            # Product image paths contain "Images" however the raw src
+            # spells their spaces; icons and sprites skip URL cleaning
+            if "Images" not in src:
                 continue
 
             # Skip status icons
             alt = (img.get("alt") or "").strip().lower()
-            if alt in {"in stock", "on backorder"}:
+            if alt in _STATUS_ALTS:
                 continue
 
-            # Skip small images
-            w = img.get("width")
-            if (isinstance(w, str) and w.isdigit() and int(w) <= 200) or (
-                isinstance(w, int) and w <= 200
-            ):
+            # Skip small images (attribute values are always strings)
+            w = img.get("width") or ""
+            if w.isdigit() and int(w) <= 200:
                 continue
 
-            full = self._clean_image_url(src, self.origin)
+            full = self._clean_image_url(src)
             if not full:
                 continue
 
@@ -149,14 +243,13 @@ class IvyclassicParser:
             if ("Single%20Item%20Images" not in full) and ("Shared%20Images" not in full):
                 continue
 
-            if full not in gallery_images:
-                gallery_images.append(full)
+            gallery_images.setdefault(full, None)
 
         return {
             "title": title,
             "description": "",
             "benefits": benefits,
-            "gallery_images": gallery_images,
+            "gallery_images": list(gallery_images),
             "brand_hint": "Ivy Classic",
             "model_product": None,
         }
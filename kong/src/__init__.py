@@ -1,5 +1,12 @@
 """KONG Company Product Collector."""
 
-collector import KongCollector, SITE_CONFIG
-
 __all__ = ["KongCollector", "SITE_CONFIG"]
+
+
+def __getattr__(name):
+    # Import the collector (and its parser/search modules) on first use,
+    # so importing the package alone stays cheap
+    if name in __all__:
+        from . import collector
+        return getattr(collector, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
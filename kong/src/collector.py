@@ -7,7 +7,7 @@ Collects product data from https://www.kongcompany.com.
 
 import os
 import sys
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 # Add parent directory to path for shared imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
@@ -65,6 +65,27 @@ class KongCollector:
         """
         return self.searcher.find_product_url(upc, http_get, timeout, log)
 
+    def find_product_urls(
+        self,
+        upcs: List[str],
+        http_get,
+        timeout: int = 30,
+        log=print
+    ) -> List[str]:
+        """
+        Find product page URLs for many UPCs, searching concurrently.
+
+        Args:
+            upcs: UPCs to search for
+            http_get: HTTP GET function (must be thread-safe)
+            timeout: Request timeout in seconds
+            log: Logging function
+
+        Returns:
+            Product URL (or empty string) per UPC, in input order
+        """
+        return self.searcher.find_product_urls(upcs, http_get, timeout, log)
+
     def parse_page(self, html_text: str) -> Dict[str, Any]:
         """
         Parse product page HTML.
@@ -5,14 +5,33 @@ Extracts product data from HTML pages.
 """
 
 import re
-import html
 from typing import Dict, Any, List
-import os
-import sys
+from lxml import html as lxml_html
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
-from shared.src import text_only
+# Pages are queried by XPath only, so skip libxml2's id table; never
+# fetch external resources while parsing
+_HTML_PARSER = lxml_html.HTMLParser(collect_ids=False, no_network=True, huge_tree=False)
+
+# Page lookups, run against one parsed lxml tree
+_TITLE_XPATH = "(//h1)[1]"
+# Candidates for the description <p> right after an <h1>, and for the
+# bullet <ul> right after a <p>; text between the pair is checked in Python
+_DESC_XPATH = "//h1/following-sibling::*[1][self::p]"
+_BULLETS_XPATH = "//ul[not(@*)][preceding-sibling::*[1][self::p]]"
+_DATA_MEDIA_XPATH = "//@data-media"
+# Cheap pre-check for _DATA_MEDIA_XPATH; HTML attribute names are
+# case-insensitive (lxml lowercases them), so the check is too
+_RE_DATA_MEDIA = re.compile(r"data-media", re.I)
+
+# One "key:GUID" (or bare "GUID") part of a data-media value; group 1 is
+# the GUID with surrounding whitespace trimmed (empty for blank parts)
+_RE_MEDIA_PART = re.compile(r"(?:[^;:]*:)?\s*([^;]*?)\s*(?:;|$)")
+
+# Gallery image URL prefix; GUIDs are requested at _medium size
+_CDN = "https://cdn.amplifi.pattern.com/"
+# Fallback: gallery image GUIDs referenced straight from the CDN
+_RE_CDN = re.compile(r"//cdn\.amplifi\.pattern\.com/([0-9a-f\-]+)_(?:small|medium)", re.I)
 
 
 class KongParser:
@@ -44,62 +63,57 @@ class KongParser:
         Returns:
             Dictionary with extracted product data
         """
-        # Extract title
-        title = ""
-        m_title = re.search(r"<h1[^>]*>(.*?)</h1>", html_text, re.DOTALL | re.I)
-        if m_title:
-            title = text_only(m_title.group(1))
+        tree = self._parse_tree(html_text)
 
-        # Extract description
+        title = ""
         description = ""
-        m_desc = re.search(r"</h1>\s*<p[^>]*>(.*?)</p>", html_text, re.DOTALL | re.I)
-        if m_desc:
-            description = text_only(m_desc.group(1))
-
-        # Extract bullet point features (benefits)
         benefits: List[str] = []
-        m_ul = re.search(r"</p>\s*<ul>(.*?)</ul>", html_text, re.DOTALL | re.I)
-        if m_ul:
-            ul_content = m_ul.group(1)
-            for m in re.finditer(
-                r"<li[^>]*>(.*?)</li>", ul_content, re.DOTALL | re.I
-            ):
-                text = text_only(m.group(1))
-                if text:
-                    benefits.append(text)
-
-        # Extract gallery images (all variants)
-        gallery: List[str] = []
-        seen_ids = set()
-
-        # Look for data-media attributes for variant image sets
-        for m in re.finditer(r'data-media="([^"]+)"', html_text, re.DOTALL | re.I):
-            data_str = html.unescape(m.group(1))
-            # data-media string format: "key1:GUID1;key2:GUID2;..."
-            parts = [p.strip() for p in data_str.split(";") if p.strip()]
-            for part in parts:
-                if ":" in part:
-                    guid = part.split(":", 1)[1]
-                else:
-                    guid = part
-                guid = guid.strip()
-                if guid and guid not in seen_ids:
-                    seen_ids.add(guid)
+        # GUIDs in first-seen order (dict keys keep insertion order)
+        seen_ids: Dict[str, None] = {}
+        if tree is not None:
+            # Extract title
+            h1 = tree.xpath(_TITLE_XPATH)
+            if h1:
+                title = self._text(h1[0])
+
+            # Extract description (first <p> directly after an <h1>)
+            for p in tree.xpath(_DESC_XPATH):
+                if self._adjacent(p):
+                    description = self._text(p)
+                    break
+
+            # Extract bullet point features (benefits) from the first bare
+            # <ul> directly after a <p>
+            for ul in tree.xpath(_BULLETS_XPATH):
+                if self._adjacent(ul):
+                    for li in ul.findall("li"):
+                        text = self._text(li)
+                        if text:
+                            benefits.append(text)
+                    break
+
+            # Look for data-media attributes for variant image sets
+            # (attribute values come back entity-decoded). Most pages
+            # have none, so a text search skips the tree walk.
+            media_values = (
+                tree.xpath(_DATA_MEDIA_XPATH) if _RE_DATA_MEDIA.search(html_text) else ()
+            )
+            for data_str in media_values:
+                # data-media string format: "key1:GUID1;key2:GUID2;..."
+                for m in _RE_MEDIA_PART.finditer(data_str):
+                    guid = m.group(1)
+                    if guid:
+                        seen_ids.setdefault(guid, None)
 
         # Fallback: parse image URLs in HTML
         if not seen_ids:
-            for m in re.finditer(
-                r"//cdn\.amplifi\.pattern\.com/([0-9a-f\-]+)_(?:small|medium)",
-                html_text,
-                re.I,
-            ):
+            for m in _RE_CDN.finditer(html_text):
                 guid = m.group(1)
-                if guid and guid not in seen_ids:
-                    seen_ids.add(guid)
+                if guid:
+                    seen_ids.setdefault(guid, None)
 
         # Construct image URLs (use _medium size for better resolution)
-        for guid in seen_ids:
-            gallery.append(f"https://cdn.amplifi.pattern.com/{guid}_medium")
+        gallery = [_CDN + guid + "_medium" for guid in seen_ids]
 
         return {
             "title": title,
@@ -109,3 +123,28 @@ class KongParser:
             "model_product": None,
             "gallery_images": gallery,
         }
+
+    @staticmethod
+    def _parse_tree(html_text: str):
+        """Parse page HTML into an lxml tree (None if empty or unparseable)."""
+        if not html_text or html_text.isspace():
+            return None
+        try:
+            tree = lxml_html.document_fromstring(html_text, parser=_HTML_PARSER)
+        except Exception:
+            return None
+        # <br> reads as a line break in extracted text, as in text_only
+        for br in tree.iter("br"):
+            br.tail = "\n" + (br.tail or "")
+        return tree
+
+    @staticmethod
+    def _adjacent(node) -> bool:
+        """Return True if only whitespace separates node from the element before it."""
+        prev = node.getprevious()
+        return isinstance(prev.tag, str) and not (prev.tail or "").strip()
+
+    @staticmethod
+    def _text(node) -> str:
+        """Return an element's text content, trimmed."""
+        return node.text_content().strip()
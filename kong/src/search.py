@@ -7,13 +7,21 @@ Handles UPC-based product search.
 import re
 import os
 import sys
-from typing import Optional, Callable, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, Any, List
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
 from shared.src import normalize_upc
 
 
+# First catalogue product link on a search results page
+_RE_CATALOGUE_LINK = re.compile(r'href="(/catalogue/[^"<>]+)"', re.I)
+
+# Search requests kept in flight at once by find_product_urls
+MAX_CONCURRENT_SEARCHES = 8
+
+
 class KongSearcher:
     """Handles product search for KONG Company."""
 
@@ -58,24 +66,72 @@ class KongSearcher:
         if clean and clean in self.upc_overrides:
             return self.upc_overrides[clean]
 
-        # Determine query (UPC or custom search term)
-        query = clean
-        search_term = self.html_search_path
-        if search_term:
-            query = search_term.format(UPC=clean) if "{UPC}" in search_term else clean
-
         # Try HTML search
-        if query and self.html_search_path and self.origin:
-            url = f"{self.origin}{self.html_search_path.format(QUERY=query)}"
+        url = self._search_url(clean)
+        if url:
             log(f"Site search (HTML): {url}")
             try:
                 r = http_get(url, timeout=timeout)
                 if r.status_code == 200:
                     # Look for any catalogue product link
-                    m = re.search(r'href="(/catalogue/[^"<>]+)"', r.text, flags=re.I)
+                    m = _RE_CATALOGUE_LINK.search(r.text)
                     if m:
                         return m.group(1)
             except Exception:
                 pass
 
         return ""
+
+    def find_product_urls(
+        self,
+        upcs: List[str],
+        http_get: Callable[[str, int], Any],
+        timeout: int,
+        log: Callable[[str], None],
+        max_workers: int = MAX_CONCURRENT_SEARCHES
+    ) -> List[str]:
+        """
+        Find product page URLs for many UPCs with concurrent searches.
+
+        Each lookup is find_product_url(); searches are I/O bound, so up
+        to max_workers run at once. http_get must be safe to call from
+        several threads.
+
+        Args:
+            upcs: UPCs to search for
+            http_get: HTTP GET function
+            timeout: Request timeout in seconds
+            log: Logging function
+            max_workers: Maximum concurrent searches
+
+        Returns:
+            Product URL (or empty string) per UPC, in input order
+        """
+        if not upcs:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(upcs))) as pool:
+            futures = [
+                pool.submit(self.find_product_url, upc, http_get, timeout, log)
+                for upc in upcs
+            ]
+            return [future.result() for future in futures]
+
+    def _search_url(self, clean: str) -> str:
+        """
+        Build the HTML search URL for a normalized UPC.
+
+        Args:
+            clean: Normalized UPC
+
+        Returns:
+            Search URL, or empty string if search is not configured
+        """
+        # Determine query (UPC or custom search term)
+        query = clean
+        search_term = self.html_search_path
+        if search_term:
+            query = search_term.format(UPC=clean) if "{UPC}" in search_term else clean
+
+        if not (query and self.html_search_path and self.origin):
+            return ""
+        return f"{self.origin}{self.html_search_path.format(QUERY=query)}"
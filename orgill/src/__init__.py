@@ -1,5 +1,5 @@
 """Orgill Product Collector."""
 
-collector import OrgillCollector, SITE_CONFIG, StrategyLoginError
+from .collector import OrgillCollector, SITE_CONFIG, StrategyLoginError
 
 __all__ = ["OrgillCollector", "SITE_CONFIG", "StrategyLoginError"]
@@ -6,9 +6,14 @@ Manages login and session authentication.
 
 import re
 import time
-from typing import Dict, Optional, Callable
+from http.cookiejar import LWPCookieJar
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, Optional, Callable, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
+from lxml import html as lxml_html
 import os
 import sys
 
@@ -17,6 +22,63 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from shared.src import text_only
 
 
+# Connection pool for privately created sessions: one host, reused sockets,
+# transient gateway errors retried with backoff. Only idempotent requests
+# are retried; re-sending the login POST could submit credentials twice,
+# and a repeated WebForms postback carries a stale __EVENTVALIDATION.
+_POOL_CONNECTIONS = 4
+_POOL_MAXSIZE = 32
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=("GET", "HEAD"),
+    raise_on_status=False,
+)
+
+# Failed-login landing URL
+_RE_LOGIN_URL = re.compile(r"/Login\b", re.I)
+
+# Login form lookups as XPath (EXSLT regex): id, name, then action, tried
+# in order
+_XPATH_NS = {"re": "http://exslt.org/regular-expressions"}
+_LOGIN_FORM_XPATHS = (
+    '(//form[re:test(@id, "login", "i")])[1]',
+    '(//form[re:test(@name, "login", "i")])[1]',
+    '(//form[re:test(@action, "login|index\\.aspx\\?tab=8", "i")])[1]',
+    "(//form)[1]",
+)
+
+# User agent when the site profile does not set one
+_DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0 Safari/537.36"
+)
+
+# Page content that only appears when signed in (ASCII; tested on raw bodies)
+_SIGNED_IN_MARKERS = (b"Sign Out", b"signOut.aspx", b"My Profile")
+
+# Login button and "remember me" checkbox of the current login form
+_SUBMIT_FIELD = "ctl00$cphMainContent$ctl00$loginOrgillxs$LoginButton"
+_REMEMBER_FIELD = "ctl00$cphMainContent$ctl00$loginOrgillxs$RememberMe"
+
+# Known username/password input names across Orgill login page versions
+_USER_FIELDS = frozenset({
+    "ctl00$cphMainContent$ctl00$loginOrgillxs$UserName",
+    "Login1$UserName",
+    "ctl00$MainContent$Login1$UserName",
+    "UserName",
+    "username",
+})
+_PASS_FIELDS = frozenset({
+    "ctl00$cphMainContent$ctl00$loginOrgillxs$Password",
+    "Login1$Password",
+    "ctl00$MainContent$Login1$Password",
+    "Password",
+    "password",
+})
+
+
 class StrategyLoginError(Exception):
     """Raised when an Orgill login attempt fails so the job can stop immediately."""
     pass
@@ -34,8 +96,30 @@ class OrgillAuthenticator:
         """
         self.config = config
         self.origin = config.get("origin", "").rstrip("/")
+        # Profile hints used on every request, resolved once
+        self._referer = config.get("referer") or ""
+        self._user_agent = config.get("user_agent") or _DEFAULT_USER_AGENT
+        self._login_url = self._abs(config.get("login_url") or "/index.aspx?tab=8")
+        # Default request headers, copied per request (Referer is filled in)
+        template = {
+            "User-Agent": self._user_agent,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+            "Referer": "",
+            "Upgrade-Insecure-Requests": "1",
+        }
+        if self.origin:
+            template["Origin"] = self.origin
+        self._headers_template: Mapping[str, str] = MappingProxyType(template)
         self.session: Optional[requests.Session] = None
         self.auth: Optional[Dict[str, str]] = None
+        # Opt-in: login cookies are kept between runs (LWP text format,
+        # owner-only permissions) only when the config names a jar file
+        jar_path = config.get("cookie_jar_path")
+        self.cookie_jar_path: Optional[str] = (
+            os.path.expanduser(jar_path) if jar_path else None
+        )
+        self._cookies_loaded = False
 
         # Detected form fields
         self._login_form_action: Optional[str] = None
@@ -51,6 +135,7 @@ class OrgillAuthenticator:
         """
         if isinstance(session, requests.Session):
             self.session = session
+            self._cookies_loaded = False
 
     def set_auth(
         self, username: str | dict, password: Optional[str] = None
@@ -74,11 +159,75 @@ class OrgillAuthenticator:
             }
 
     def _ensure_session(self) -> requests.Session:
-        """Return the attached session or create a private one if absent."""
+        """
+        Return the attached session or create a private one if absent.
+
+        Private sessions mount a pooled, retrying adapter so the probe,
+        login and search requests share keep-alive connections. Attached
+        sessions are used as configured by their owner.
+        """
         if not isinstance(self.session, requests.Session):
-            self.session = requests.Session()
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=_POOL_CONNECTIONS,
+                pool_maxsize=_POOL_MAXSIZE,
+                max_retries=_RETRY,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self.session = session
+        if not self._cookies_loaded:
+            self._cookies_loaded = True
+            self._load_cookies(self.session)
         return self.session
 
+    def _load_cookies(self, session: requests.Session) -> None:
+        """
+        Restore cookies saved by a previous run into a session.
+
+        Expired cookies are dropped; a missing or unreadable jar is ignored.
+
+        Args:
+            session: Session to receive the cookies
+        """
+        path = self.cookie_jar_path
+        if not path or not os.path.isfile(path):
+            return
+        jar = LWPCookieJar()
+        try:
+            jar.load(path, ignore_discard=True)
+        except Exception:
+            return
+        for cookie in jar:
+            session.cookies.set_cookie(cookie)
+
+    def _save_cookies(self, session: requests.Session) -> None:
+        """
+        Save a session's cookies for the next run (best effort).
+
+        Args:
+            session: Authenticated session
+        """
+        path = self.cookie_jar_path
+        if not path:
+            return
+        jar = LWPCookieJar()
+        for cookie in session.cookies:
+            jar.set_cookie(cookie)
+        try:
+            directory = os.path.dirname(path)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+                # makedirs' mode is filtered by the umask; set it outright
+                os.chmod(directory, 0o700)
+            # Create (or tighten) the jar as owner-only before any cookie
+            # is written; save() keeps an existing file's mode
+            os.close(os.open(path, os.O_WRONLY | os.O_CREAT, 0o600))
+            os.chmod(path, 0o600)
+            jar.save(path, ignore_discard=True)
+        except Exception:
+            pass
+
     def _abs(self, path_or_url: str) -> str:
         """Convert relative path to absolute URL."""
         if not path_or_url:
@@ -94,21 +243,15 @@ class OrgillAuthenticator:
         ua: Optional[str] = None,
     ) -> Dict[str, str]:
         """Build 'browsery' headers using site profile hints with safe fallbacks."""
-        origin = (origin or self.config.get("origin") or "").rstrip("/")
-        referer = referer or self.config.get("referer") or origin or ""
-        ua = ua or self.config.get("user_agent") or (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0 Safari/537.36"
-        )
-        h = {
-            "User-Agent": ua,
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Referer": referer,
-            "Upgrade-Insecure-Requests": "1",
-        }
+        origin = origin.rstrip("/") if origin else self.origin
+        h = self._headers_template.copy()
+        if ua:
+            h["User-Agent"] = ua
+        h["Referer"] = referer or self._referer or origin
         if origin:
             h["Origin"] = origin
+        else:
+            h.pop("Origin", None)
         return h
 
     def _parse_hidden_fields(self, html_text: str) -> Dict[str, str]:
@@ -128,47 +271,19 @@ class OrgillAuthenticator:
         self._detected_user_field = None
         self._detected_pass_field = None
 
-        soup = BeautifulSoup(html_text or "", "html.parser")
-
-        # Find login form
-        form = (
-            soup.find("form", id=re.compile(r"login", re.I))
-            or soup.find("form", {"name": re.compile(r"login", re.I)})
-            or soup.find("form", action=re.compile(r"login|index\.aspx\?tab=8", re.I))
-            or soup.find("form")
-        )
-
-        if form:
-            action = form.get("action") or ""
-            self._login_form_action = self._abs(action) if action else None
-            inputs = form.find_all("input")
-        else:
-            inputs = soup.find_all("input")
-
-        user_candidates = [
-            "ctl00$cphMainContent$ctl00$loginOrgillxs$UserName",
-            "Login1$UserName",
-            "ctl00$MainContent$Login1$UserName",
-            "UserName",
-            "username",
-        ]
-        pass_candidates = [
-            "ctl00$cphMainContent$ctl00$loginOrgillxs$Password",
-            "Login1$Password",
-            "ctl00$MainContent$Login1$Password",
-            "Password",
-            "password",
-        ]
-
-        for el in inputs:
-            typ = (el.get("type") or "").lower()
-            name = el.get("name") or ""
-            val = el.get("value") or ""
-            if typ == "hidden" and name:
-                vals[name] = val
-            if not self._detected_user_field and name in user_candidates:
+        action, inputs = self._login_form_inputs(html_text)
+        if action:
+            self._login_form_action = self._abs(action)
+
+        for attrs in inputs:
+            name = attrs.get("name") or ""
+            if not name:
+                continue
+            if (attrs.get("type") or "").lower() == "hidden":
+                vals[name] = attrs.get("value") or ""
+            if not self._detected_user_field and name in _USER_FIELDS:
                 self._detected_user_field = name
-            if not self._detected_pass_field and name in pass_candidates:
+            if not self._detected_pass_field and name in _PASS_FIELDS:
                 self._detected_pass_field = name
 
         # Ensure WebForms scaffolding keys exist
@@ -177,6 +292,35 @@ class OrgillAuthenticator:
 
         return vals
 
+    @staticmethod
+    def _login_form_inputs(html_text: str) -> Tuple[Optional[str], List[Mapping[str, str]]]:
+        """
+        Locate the login form and collect its inputs' attributes.
+
+        The form is the first one whose id, then name, then action looks
+        like a login form, else the first form; without any form, every
+        input on the page is returned.
+
+        Args:
+            html_text: HTML content
+
+        Returns:
+            Tuple of (form action or None, attribute mapping per input)
+        """
+        try:
+            tree = lxml_html.document_fromstring(html_text or "")
+        except Exception:
+            return None, []
+        form = None
+        for xpath in _LOGIN_FORM_XPATHS:
+            found = tree.xpath(xpath, namespaces=_XPATH_NS)
+            if found:
+                form = found[0]
+                break
+        if form is None:
+            return None, [el.attrib for el in tree.iter("input")]
+        return form.get("action"), [el.attrib for el in form.iter("input")]
+
     def _extract_inline_error(self, html_text: str) -> str:
         """
         Pull inline error text if present.
@@ -188,7 +332,7 @@ class OrgillAuthenticator:
             Error message or empty string
         """
         try:
-            soup = BeautifulSoup(html_text or "", "html.parser")
+            soup = BeautifulSoup(html_text or "", "lxml")
             lbl = soup.select_one("#cphMainContent_lblErrorMessage")
             if lbl:
                 msg = text_only(lbl.get_text(" ", strip=True))
@@ -206,6 +350,61 @@ class OrgillAuthenticator:
             pass
         return ""
 
+    @staticmethod
+    def _is_signed_in(body: bytes) -> bool:
+        """
+        Check a raw response body for signed-in page markers.
+
+        Args:
+            body: Response content
+
+        Returns:
+            True if any signed-in marker is present
+        """
+        return any(marker in body for marker in _SIGNED_IN_MARKERS)
+
+    @staticmethod
+    def _login_payloads(
+        hidden: Dict[str, str],
+        user_field: str,
+        user: str,
+        pass_field: str,
+        pwd: str,
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Yield the login POST payload variants, in the order to try them.
+
+        Each variant is built only when requested, so the usual first-try
+        login copies the hidden fields once.
+
+        Args:
+            hidden: Hidden fields of the login form
+            user_field: Username input name
+            user: Username
+            pass_field: Password input name
+            pwd: Password
+
+        Yields:
+            Form payload per variant
+        """
+        # Variant A: include the submit button field
+        payload = dict(hidden)
+        payload[user_field] = user
+        payload[pass_field] = pwd
+        payload[_SUBMIT_FIELD] = payload.get(_SUBMIT_FIELD, "LOGIN") or "LOGIN"
+        if _REMEMBER_FIELD in payload:
+            payload[_REMEMBER_FIELD] = "on"
+        yield payload
+
+        # Variant B: drive __EVENTTARGET instead
+        payload = dict(hidden)
+        payload["__EVENTTARGET"] = _SUBMIT_FIELD
+        payload[user_field] = user
+        payload[pass_field] = pwd
+        if _REMEMBER_FIELD in payload:
+            payload[_REMEMBER_FIELD] = "on"
+        yield payload
+
     def login(self, log: Callable[[str], None], timeout: int = 20) -> bool:
         """
         Authenticate against the Orgill portal.
@@ -234,11 +433,7 @@ class OrgillAuthenticator:
                 timeout=timeout,
                 allow_redirects=True,
             )
-            if r0.status_code == 200 and (
-                ("Sign Out" in r0.text)
-                or ("signOut.aspx" in r0.text)
-                or ("My Profile" in r0.text)
-            ):
+            if r0.status_code == 200 and self._is_signed_in(r0.content):
                 return True
         except Exception:
             pass
@@ -255,15 +450,8 @@ class OrgillAuthenticator:
                 "OrgillStrategy: no credentials present in auth; cannot log in."
             )
 
-        # Default login landing
-        profile_login_url = self.config.get("login_url")
-        login_url = self._abs("/index.aspx?tab=8")
-        if profile_login_url:
-            login_url = (
-                profile_login_url
-                if profile_login_url.lower().startswith("http")
-                else self._abs(profile_login_url)
-            )
+        # Login landing (profile login_url, else the default login tab)
+        login_url = self._login_url
 
         # 1) Priming GET — establish cookies + pull hidden fields
         hdrs_get = self._browser_headers(referer=self.origin, origin=self.origin)
@@ -303,9 +491,6 @@ class OrgillAuthenticator:
             or "ctl00$cphMainContent$ctl00$loginOrgillxs$Password"
         )
 
-        submit_field = "ctl00$cphMainContent$ctl00$loginOrgillxs$LoginButton"
-        remember_key = "ctl00$cphMainContent$ctl00$loginOrgillxs$RememberMe"
-
         time.sleep(0.35)  # brief pause for WAF friendliness
 
         ok = False
@@ -313,23 +498,8 @@ class OrgillAuthenticator:
         hdrs_post = self._browser_headers(referer=login_url, origin=self.origin)
         hdrs_post["Content-Type"] = "application/x-www-form-urlencoded"
 
-        # Variant A: include the submit button field
-        payload_a = dict(hidden)
-        payload_a[user_field] = user
-        payload_a[pass_field] = pwd
-        payload_a[submit_field] = payload_a.get(submit_field, "LOGIN") or "LOGIN"
-        if remember_key in payload_a:
-            payload_a[remember_key] = "on"
-
-        # Variant B: drive __EVENTTARGET instead
-        payload_b = dict(hidden)
-        payload_b["__EVENTTARGET"] = submit_field
-        payload_b[user_field] = user
-        payload_b[pass_field] = pwd
-        if remember_key in payload_b:
-            payload_b[remember_key] = "on"
-
-        for idx, payload in enumerate((payload_a, payload_b), 1):
+        payloads = self._login_payloads(hidden, user_field, user, pass_field, pwd)
+        for idx, payload in enumerate(payloads, 1):
             try:
                 r2 = session.post(
                     post_url,
@@ -364,31 +534,24 @@ class OrgillAuthenticator:
                 log(f"OrgillStrategy: variant {idx} landed at {chain}")
 
                 # Heuristic success checks
-                if r2.url and re.search(r"/Login\b", r2.url, re.I):
+                if r2.url and _RE_LOGIN_URL.search(r2.url):
                     last_text = r2.text or ""
                     continue
-                if (
-                    ("Sign Out" in r2.text)
-                    or ("signOut.aspx" in r2.text)
-                    or ("My Profile" in r2.text)
-                ):
+                if self._is_signed_in(r2.content):
                     ok = True
                     break
 
-                # Fallback probe for signed-in UI
+                # Fallback probe for signed-in UI (only when the POST landed
+                # neither on the login page nor on a signed-in page)
                 rp = session.get(
                     self._abs("/Default.aspx"),
                     headers=self._browser_headers(referer=post_url, origin=self.origin),
                     timeout=timeout,
                 )
-                last_text = rp.text or r2.text or ""
-                if rp.status_code == 200 and (
-                    ("Sign Out" in rp.text)
-                    or ("signOut.aspx" in rp.text)
-                    or ("My Profile" in rp.text)
-                ):
+                if rp.status_code == 200 and self._is_signed_in(rp.content):
                     ok = True
                     break
+                last_text = rp.text or r2.text or ""
             except Exception as e:
                 last_text = ""
                 log(f"OrgillStrategy: variant {idx} POST error: {e}")
@@ -401,4 +564,5 @@ class OrgillAuthenticator:
                 "OrgillStrategy: login failed (no auth cookie or success indicators)."
             )
 
+        self._save_cookies(session)
         return True
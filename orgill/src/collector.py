@@ -7,7 +7,7 @@ Collects product data from https://www.orgill.com.
 
 import os
 import sys
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 # Add parent directory to path for shared imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
@@ -92,6 +92,31 @@ class OrgillCollector:
         # Perform search
         return self.searcher.find_product_url(upc, session, timeout, log)
 
+    def find_product_urls(
+        self, upcs: List[str], http_get=None, timeout: int = 20, log=print
+    ) -> List[str]:
+        """
+        Find product page URLs for many UPCs after a single login.
+
+        Logs in once, then runs the searches in turn on the shared
+        authenticated session.
+
+        Args:
+            upcs: UPCs to search for
+            http_get: HTTP GET function (not used, kept for interface compatibility)
+            timeout: Request timeout in seconds
+            log: Logging function
+
+        Returns:
+            Product URL (or empty string) per UPC, in input order
+
+        Raises:
+            StrategyLoginError: If authentication fails
+        """
+        self.authenticator.login(log, timeout=timeout)
+        session = self.authenticator._ensure_session()
+        return self.searcher.find_product_urls(upcs, session, timeout, log)
+
     def parse_page(self, html_text: str) -> Dict[str, Any]:
         """
         Parse product page HTML.
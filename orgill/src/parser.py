@@ -6,8 +6,9 @@ Extracts product data from HTML pages.
 
 import re
 import html
+from functools import lru_cache
 from typing import Dict, Any, List
-from bs4 import BeautifulSoup
+from lxml import html as lxml_html
 import os
 import sys
 
@@ -15,6 +16,41 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
 from shared.src import text_only
 
+# Gallery images served from the Orgill CDN
+_RE_ORGILL_CDN = re.compile(r"https?://images\.orgill\.com/weblarge/[^\"]+\.jpg", re.I)
+
+# Page lookups as XPath (EXSLT regex), run against one parsed lxml tree
+_XPATH_NS = {"re": "http://exslt.org/regular-expressions"}
+_BY_ID_XPATH = "(//*[@id = $id])[1]"
+_DESC_XPATH = r'(.//p[re:test(@class, "\btext-details-description\b", "i")])[1]'
+_FEATURES_HEADER_XPATH = (
+    r'//*[self::h3 or self::h4][re:test(@class, "\btext-details-header\b", "i")]'
+)
+# First element after a node's start tag (its descendants, then what follows)
+_FEATURES_LIST_XPATH = (
+    "(descendant::* | following::*)"
+    "[self::ul or self::ol or ((self::div or self::section) and .//li)][1]"
+)
+_FEATURES_BLOCK_XPATH = "(descendant::* | following::*)[self::ul or self::ol or .//li][1]"
+# Parent of the first text or comment node reading just "Features". A
+# native case-folded contains() screens nodes first so the regex callback
+# only runs on likely candidates ("ſ" is the long s that re.I also folds
+# to "s").
+_FEATURES_LABEL_XPATH = (
+    r'(//text()[contains(translate(., "FEATURSſ", "featurss"), "features")]'
+    r'[re:test(., "^\s*Features\s*$", "i")]'
+    r' | //comment()[contains(translate(., "FEATURSſ", "featurss"), "features")]'
+    r'[re:test(., "^\s*Features\s*$", "i")])[1]/..'
+)
+# Visible text nodes (script/style/template bodies are not page text)
+_TEXT_XPATH = ".//text()[not(ancestor::script or ancestor::style or ancestor::template)]"
+
+
+@lru_cache(maxsize=128)
+def _id_pattern(element_id: str):
+    """Compiled raw-HTML fallback pattern for an element's text by id."""
+    return re.compile(rf'id="{re.escape(element_id)}"\s*>\s*([^<]+)<')
+
 
 class OrgillParser:
     """Parses Orgill product pages."""
@@ -28,30 +64,128 @@ class OrgillParser:
         """
         self.origin = origin
 
-    def _grab_id(self, soup: BeautifulSoup, html_text: str, element_id: str) -> str:
+    @staticmethod
+    def _parse_tree(html_text: str):
+        """Parse page HTML into an lxml tree (None if empty or unparseable)."""
+        if not html_text or html_text.isspace():
+            return None
+        try:
+            return lxml_html.document_fromstring(html_text)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _text(node, separator: str = "") -> str:
+        """
+        Join a node's stripped, non-empty text fragments.
+
+        Args:
+            node: lxml element
+            separator: String placed between fragments
+
+        Returns:
+            Element text
+        """
+        parts = (t.strip() for t in node.xpath(_TEXT_XPATH, smart_strings=False))
+        return separator.join(t for t in parts if t)
+
+    @staticmethod
+    def _by_id(tree, element_id: str):
+        """First element of an lxml tree with the given id, or None."""
+        found = tree.xpath(_BY_ID_XPATH, id=element_id)
+        return found[0] if found else None
+
+    def _grab_id(self, tree, html_text: str, element_id: str) -> str:
         """
         Extract text from element by ID.
 
         Args:
-            soup: BeautifulSoup object
+            tree: lxml tree (None if the page could not be parsed)
             html_text: Raw HTML text
             element_id: Element ID to find
 
         Returns:
             Extracted text
         """
-        el = soup.select_one(f"#{element_id}")
-        if el:
-            return text_only(el.get_text(" ", strip=True))
-        m = re.search(rf'id="{re.escape(element_id)}"\s*>\s*([^<]+)<', html_text or "")
+        if tree is not None:
+            el = self._by_id(tree, element_id)
+            if el is not None:
+                return text_only(self._text(el, " "))
+        m = _id_pattern(element_id).search(html_text or "")
         return text_only(m.group(1)) if m else ""
 
-    def _first_overview_paragraph(self, container) -> str:
-        """Extract first overview paragraph."""
-        if not container:
-            return ""
-        p = container.find("p", class_=re.compile(r"\btext-details-description\b", re.I))
-        return text_only(p.get_text(" ", strip=True)) if p else ""
+    def _list_items(self, found: List[Any]) -> List[str]:
+        """
+        Text of the list items inside the first matched block.
+
+        Args:
+            found: XPath result (the block, or empty)
+
+        Returns:
+            Non-empty item texts
+        """
+        if not found:
+            return []
+        items: List[str] = []
+        for li in found[0].iterdescendants("li"):
+            txt = text_only(self._text(li, " "))
+            if txt:
+                items.append(txt)
+        return items
+
+    def _tree_fields(self, tree, html_text: str) -> Dict[str, Any]:
+        """
+        Extract the text fields of a product page from an lxml tree.
+
+        Args:
+            tree: Parsed page
+            html_text: Raw HTML text (for by-id fallbacks)
+
+        Returns:
+            Dictionary of title, brand_hint, description and benefits
+        """
+        title = self._grab_id(
+            tree, html_text, "cphMainContent_ctl00_lblDescription"
+        ) or self._grab_id(tree, html_text, "cphMainContent_lblDescription")
+
+        brand_el = self._by_id(tree, "cphMainContent_ctl00_lblVendorName")
+        if brand_el is None:
+            brand_el = self._by_id(tree, "cphMainContent_lblVendorName")
+        brand = text_only(self._text(brand_el, " ")) if brand_el is not None else ""
+
+        description = ""
+        for overview_id in (
+            "cphMainContent_ctl00_lblProductOverview",
+            "cphMainContent_ctl00_lblProductOverviewxs",
+        ):
+            pov = self._by_id(tree, overview_id)
+            if pov is None:
+                continue
+            found = pov.xpath(_DESC_XPATH, namespaces=_XPATH_NS)
+            description = text_only(self._text(found[0], " ")) if found else ""
+            if description:
+                break
+
+        # Features list: the first list-like block after the "Features"
+        # header, else after a bare "Features" label
+        benefits: List[str] = []
+        for h in tree.xpath(_FEATURES_HEADER_XPATH, namespaces=_XPATH_NS):
+            header_text = "".join(h.xpath(_TEXT_XPATH, smart_strings=False))
+            if text_only(header_text).lower() == "features":
+                benefits = self._list_items(h.xpath(_FEATURES_LIST_XPATH))
+                break
+
+        if not benefits:
+            label = tree.xpath(_FEATURES_LABEL_XPATH, namespaces=_XPATH_NS)
+            if label:
+                benefits = self._list_items(label[0].xpath(_FEATURES_BLOCK_XPATH))
+
+        return {
+            "title": title,
+            "brand_hint": brand,
+            "description": description,
+            "benefits": benefits,
+        }
 
     def parse_page(self, html_text: str) -> Dict[str, Any]:
         """
@@ -72,94 +206,33 @@ class OrgillParser:
         Returns:
             Dictionary with extracted product data
         """
-        soup = BeautifulSoup(html_text or "", "html.parser")
-
-        # Extract title
-        title = self._grab_id(
-            soup, html_text, "cphMainContent_ctl00_lblDescription"
-        ) or self._grab_id(soup, html_text, "cphMainContent_lblDescription")
-
-        # Extract brand (Vendor)
-        brand_el = soup.select_one(
-            "#cphMainContent_ctl00_lblVendorName"
-        ) or soup.select_one("#cphMainContent_lblVendorName")
-        brand = text_only(brand_el.get_text(" ", strip=True)) if brand_el else ""
-
-        # Extract description (Product Overview)
-        pov = soup.select_one("#cphMainContent_ctl00_lblProductOverview")
-        pov_xs = soup.select_one("#cphMainContent_ctl00_lblProductOverviewxs")
-        description = self._first_overview_paragraph(pov) or self._first_overview_paragraph(
-            pov_xs
-        )
-
-        # Extract benefits (Features list)
-        benefits: List[str] = []
-
-        # Find the "Features" header
-        header = None
-        for h in soup.find_all(
-            ["h3", "h4"], class_=re.compile(r"\btext-details-header\b", re.I)
-        ):
-            if text_only(h.get_text()).lower() == "features":
-                header = h
-                break
-
-        # From that header, locate the first following UL/OL
-        if header:
-            list_container = header.find_next(
-                lambda t: (
-                    t.name in ("ul", "ol")
-                    or (t.name in ("div", "section") and t.find("li"))
-                )
-            )
-            if list_container:
-                for li in list_container.find_all("li"):
-                    txt = text_only(li.get_text(" ", strip=True))
-                    if txt:
-                        benefits.append(txt)
-
-        # Fallback: if nothing found, try any block adjacent to "Features" label
-        if not benefits:
-            cand = soup.find(string=re.compile(r"^\s*Features\s*$", re.I))
-            if cand:
-                parent = getattr(cand, "parent", None)
-                block = (
-                    parent.find_next(
-                        lambda t: t and (t.name in ("ul", "ol") or t.find("li"))
-                    )
-                    if parent
-                    else None
-                )
-                if block:
-                    for li in block.find_all("li"):
-                        txt = text_only(li.get_text(" ", strip=True))
-                        if txt:
-                            benefits.append(txt)
-
-        # Extract gallery images (Orgill CDN)
-        imgs: List[str] = []
-        for m in re.finditer(
-            r"https?://images\.orgill\.com/weblarge/[^\"]+\.jpg",
-            html_text or "",
-            flags=re.I,
-        ):
-            u = html.unescape(m.group(0))
-            if u not in imgs:
-                imgs.append(u)
+        tree = self._parse_tree(html_text)
+        if tree is not None:
+            fields = self._tree_fields(tree, html_text)
+        else:
+            fields = {"title": "", "brand_hint": "", "description": "", "benefits": []}
+
+        # Extract gallery images (Orgill CDN), first-seen order (dict keys
+        # keep insertion order)
+        unescape = html.unescape
+        seen_imgs: Dict[str, None] = {}
+        for m in _RE_ORGILL_CDN.finditer(html_text or ""):
+            seen_imgs.setdefault(unescape(m.group(0)), None)
+        imgs: List[str] = list(seen_imgs)
 
         # Extract additional metadata
         country = self._grab_id(
-            soup, html_text, "cphMainContent_ctl00_lblCountryOfOrigin"
+            tree, html_text, "cphMainContent_ctl00_lblCountryOfOrigin"
         )
         item_number = self._grab_id(
-            soup, html_text, "cphMainContent_ctl00_lblOrgillItemNumber"
+            tree, html_text, "cphMainContent_ctl00_lblOrgillItemNumber"
         )
 
         return {
-            "title": title,
-            "brand_hint": brand,
-            "description": description,
-            "benefits": benefits,
+            "title": fields["title"],
+            "brand_hint": fields["brand_hint"],
+            "description": fields["description"],
+            "benefits": fields["benefits"],
             "gallery_images": imgs,
             "country_of_origin": country,
             "orgill_item_number": item_number,
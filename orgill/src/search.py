@@ -6,7 +6,9 @@ Handles authenticated UPC-based product search.
 
 import re
 import html
-from typing import Tuple, Callable, Dict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Tuple, Callable, Dict, List, Mapping, Optional
 import requests
 import os
 import sys
@@ -16,6 +18,38 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from shared.src import normalize_upc
 
 
+# Product links in a raw results page, in one pass; by priority an escaped
+# tab=7 link (a) anywhere beats a plain one (b), which beats a slug (c).
+# The link is captured in a lookahead so matches never hide one another.
+_RE_PRODUCT_ANY = re.compile(
+    rb'href="(?=(?P<a>/index\.aspx\?tab=7&amp;sku=\d+)"'
+    rb'|(?P<b>/index\.aspx\?tab=7&sku=\d+)"'
+    rb'|(?P<c>/product/[^"]+)")',
+    re.I,
+)
+# A search that lands straight on a product page
+_RE_TAB7_URL = re.compile(r"/index\.aspx\?tab=7(&|&amp;)sku=\d+", re.I)
+
+# Search request headers, copied per request (Referer/Origin are filled in)
+_HEADERS_TEMPLATE: Mapping[str, str] = MappingProxyType({
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Referer": "",
+    "Upgrade-Insecure-Requests": "1",
+    "Origin": "",
+})
+
+@lru_cache(maxsize=64)
+def _abs_url(origin: str, path_or_url: str) -> str:
+    """Absolute URL for a site path (absolute URLs pass through)."""
+    if not path_or_url:
+        return ""
+    if path_or_url.lower().startswith("http"):
+        return path_or_url
+    return f"{origin}/{path_or_url.lstrip('/')}"
+
+
 class OrgillSearcher:
     """Handles product search for Orgill."""
 
@@ -29,14 +63,13 @@ class OrgillSearcher:
         self.origin = config.get("origin", "").rstrip("/")
         search_config = config.get("search", {})
         self.upc_overrides = search_config.get("upc_overrides", {})
+        # URL -> (ETag, hash of body, hidden fields) of the last search page
+        # parsed, so an unchanged page is not re-parsed for every UPC
+        self._hidden_cache: Dict[str, Tuple[str, int, Dict[str, str]]] = {}
 
     def _abs(self, path_or_url: str) -> str:
         """Convert relative path to absolute URL."""
-        if not path_or_url:
-            return ""
-        if path_or_url.lower().startswith("http"):
-            return path_or_url
-        return f"{self.origin}/{path_or_url.lstrip('/')}"
+        return _abs_url(self.origin, path_or_url)
 
     def _browser_headers(
         self,
@@ -45,22 +78,17 @@ class OrgillSearcher:
     ) -> Dict[str, str]:
         """Build browser headers."""
         origin = (origin or self.origin).rstrip("/")
-        referer = referer or origin or ""
-        return {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Referer": referer,
-            "Upgrade-Insecure-Requests": "1",
-            "Origin": origin,
-        }
+        h = _HEADERS_TEMPLATE.copy()
+        h["Referer"] = referer or origin or ""
+        h["Origin"] = origin
+        return h
 
     def _parse_hidden_fields(self, html_text: str) -> Dict[str, str]:
         """Extract hidden form fields."""
         from bs4 import BeautifulSoup
 
         vals: Dict[str, str] = {}
-        soup = BeautifulSoup(html_text or "", "html.parser")
+        soup = BeautifulSoup(html_text or "", "lxml")
         for el in soup.find_all("input", {"type": "hidden"}):
             name = el.get("name") or ""
             val = el.get("value") or ""
@@ -73,13 +101,45 @@ class OrgillSearcher:
 
         return vals
 
+    def _cached_hidden_fields(
+        self, url: str, response: requests.Response
+    ) -> Optional[Dict[str, str]]:
+        """
+        Hidden fields of a fetched page, reusing the last parse when unchanged.
+
+        A 304 (answer to If-None-Match) or a body identical to the cached
+        one returns the cached fields without parsing.
+
+        Args:
+            url: Page URL (cache key)
+            response: Response for url
+
+        Returns:
+            Hidden field values (shared; do not mutate), or None if the
+            response is not usable
+        """
+        cached = self._hidden_cache.get(url)
+        if response.status_code == 304 and cached:
+            return cached[2]
+        if response.status_code != 200:
+            return None
+
+        # Compare raw bodies; only a changed page is decoded and parsed
+        digest = hash(response.content)
+        if cached and cached[1] == digest:
+            return cached[2]
+
+        hidden = self._parse_hidden_fields(response.text)
+        self._hidden_cache[url] = (response.headers.get("ETag") or "", digest, hidden)
+        return hidden
+
     def _search_upc(
         self,
         upc: str,
         session: requests.Session,
         timeout: int,
         log: Callable[[str], None],
-    ) -> Tuple[str, str]:
+    ) -> Tuple[str, bytes]:
         """
         Perform an authenticated UPC search.
 
@@ -90,20 +150,20 @@ class OrgillSearcher:
             log: Logging function
 
         Returns:
-            Tuple of (final_url, html_text)
+            Tuple of (final_url, raw response body)
         """
         home_url = self._abs("/Default.aspx")
         try:
-            r = session.get(
-                home_url,
-                headers=self._browser_headers(referer=home_url, origin=self.origin),
-                timeout=timeout,
-            )
-            if r.status_code != 200:
-                return "", ""
-            hidden = self._parse_hidden_fields(r.text)
+            hdrs_get = self._browser_headers(referer=home_url, origin=self.origin)
+            cached = self._hidden_cache.get(home_url)
+            if cached and cached[0]:
+                hdrs_get["If-None-Match"] = cached[0]
+            r = session.get(home_url, headers=hdrs_get, timeout=timeout)
+            hidden = self._cached_hidden_fields(home_url, r)
+            if hidden is None:
+                return "", b""
         except Exception:
-            return "", ""
+            return "", b""
 
         possible_fields = [
             {
@@ -138,7 +198,7 @@ class OrgillSearcher:
                     allow_redirects=True,
                 )
                 if pr.status_code == 200:
-                    return pr.url, pr.text
+                    return pr.url, pr.content
             except Exception:
                 pass
 
@@ -152,24 +212,25 @@ class OrgillSearcher:
                 allow_redirects=True,
             )
             if fr.status_code == 200:
-                return fr.url, fr.text
+                return fr.url, fr.content
         except Exception:
             pass
 
-        return "", ""
-
-    def _extract_product_link(self, html_text: str) -> str:
-        """Extract product link from search results."""
-        m = re.search(r'href="(/index\.aspx\?tab=7&amp;sku=\d+)"', html_text, re.I)
-        if m:
-            return html.unescape(m.group(1)).replace("&amp;", "&")
-        m = re.search(r'href="(/index\.aspx\?tab=7&sku=\d+)"', html_text, re.I)
-        if m:
-            return html.unescape(m.group(1))
-        m = re.search(r'href="(/product/[^"]+)"', html_text, re.I)
-        if m:
-            return html.unescape(m.group(1))
-        return ""
+        return "", b""
+
+    def _extract_product_link(self, html_body: bytes) -> str:
+        """Extract product link from raw search results; only the link is decoded."""
+        plain = slug = None
+        for m in _RE_PRODUCT_ANY.finditer(html_body):
+            link = m.group("a")
+            if link:
+                return html.unescape(link.decode("utf-8", "replace")).replace("&amp;", "&")
+            if plain is None:
+                plain = m.group("b")
+            if slug is None:
+                slug = m.group("c")
+        link = plain or slug
+        return html.unescape(link.decode("utf-8", "replace")) if link else ""
 
     def find_product_url(
         self,
@@ -199,14 +260,40 @@ class OrgillSearcher:
             return self.upc_overrides[upc_digits]
 
         # Perform search
-        final_url, html_text = self._search_upc(upc_digits, session, timeout, log)
-        if not html_text:
+        final_url, html_body = self._search_upc(upc_digits, session, timeout, log)
+        if not html_body:
             return ""
 
         # Check if we're already on a product page
-        if re.search(r"/index\.aspx\?tab=7(&|&amp;)sku=\d+", final_url or "", re.I):
+        if _RE_TAB7_URL.search(final_url or ""):
             return self._abs(final_url)
 
         # Extract product link from results
-        rel = self._extract_product_link(html_text)
+        rel = self._extract_product_link(html_body)
         return self._abs(rel) if rel else ""
+
+    def find_product_urls(
+        self,
+        upcs: List[str],
+        session: requests.Session,
+        timeout: int,
+        log: Callable[[str], None],
+    ) -> List[str]:
+        """
+        Find product page URLs for many UPCs on one authenticated session.
+
+        Each lookup is find_product_url(), run one after another: ASP.NET
+        serializes requests per session, so parallel postbacks on a single
+        login gain little, and requests.Session is not thread-safe. The
+        batch still shares the login and the cached search page fields.
+
+        Args:
+            upcs: UPCs to search for
+            session: Authenticated session
+            timeout: Request timeout in seconds
+            log: Logging function
+
+        Returns:
+            Product URL (or empty string) per UPC, in input order
+        """
+        return [self.find_product_url(upc, session, timeout, log) for upc in upcs]
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test Batch UPC Search
+
+Tests OrgillSearcher.find_product_urls against a recorded-response session:
+results keep input order, UPC overrides skip the site, and UPCs that
+normalize to nothing return an empty URL.
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.search import OrgillSearcher
+
+
+ORIGIN = "https://www.orgill.com"
+HOME = '<form><input type="hidden" name="__VIEWSTATE" value="vs"></form>'
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, url, body, status_code=200):
+        self.url = url
+        self.text = body
+        self.content = body.encode("utf-8")
+        self.status_code = status_code
+        self.headers = {}
+
+
+class FakeSession:
+    """Answers the home page GET and the search postback for known UPCs."""
+
+    def __init__(self, skus):
+        self.skus = skus
+        self.searched = []
+
+    def get(self, url, **kwargs):
+        return FakeResponse(url, HOME)
+
+    def post(self, url, data=None, **kwargs):
+        upc = data["txtAdvKeyword1"]
+        self.searched.append(upc)
+        sku = self.skus.get(upc)
+        body = f'<a href="/index.aspx?tab=7&amp;sku={sku}">item</a>' if sku else "<p>none</p>"
+        return FakeResponse(url, body)
+
+
+def make_searcher(overrides=None):
+    """Searcher for the Orgill origin with the given UPC overrides."""
+    return OrgillSearcher({"origin": ORIGIN, "search": {"upc_overrides": overrides or {}}})
+
+
+def test_batch_keeps_input_order():
+    """Test that batch results line up with the input UPCs."""
+    session = FakeSession({"111111111111": "1001", "222222222222": "1002"})
+    searcher = make_searcher()
+
+    urls = searcher.find_product_urls(
+        ["222222222222", "333333333333", "111111111111"], session, 5, lambda msg: None
+    )
+
+    assert urls == [
+        f"{ORIGIN}/index.aspx?tab=7&sku=1002",
+        "",
+        f"{ORIGIN}/index.aspx?tab=7&sku=1001",
+    ], f"Unexpected results: {urls}"
+    assert session.searched == ["222222222222", "333333333333", "111111111111"]
+    print("✓ Batch results keep input order")
+
+
+def test_batch_uses_overrides():
+    """Test that overridden UPCs are answered without a site search."""
+    override_url = f"{ORIGIN}/index.aspx?tab=7&sku=9999"
+    session = FakeSession({"111111111111": "1001"})
+    searcher = make_searcher({"444444444444": override_url})
+
+    urls = searcher.find_product_urls(
+        ["4444-4444-4444", "111111111111", "n/a"], session, 5, lambda msg: None
+    )
+
+    assert urls == [
+        override_url,
+        f"{ORIGIN}/index.aspx?tab=7&sku=1001",
+        "",
+    ], f"Unexpected results: {urls}"
+    assert session.searched == ["111111111111"], "Overrides must not hit the site"
+    print("✓ Overrides and empty UPCs skip the site search")
+
+
+if __name__ == "__main__":
+    test_batch_keeps_input_order()
+    test_batch_uses_overrides()
@@ -6,6 +6,7 @@ from .http_utils import build_browser_headers, RateLimiter
 from .json_utils import extract_json_from_script, load_json_file
 from .upc_utils import normalize_upc, is_valid_upc
 from .excel_utils import excel_to_json, is_excel_file, load_products
+from .regex_utils import compile_linear
 
 __all__ = [
     "text_only",
@@ -22,4 +23,5 @@ __all__ = [
     "excel_to_json",
     "is_excel_file",
     "load_products",
+    "compile_linear",
 ]
@@ -0,0 +1,53 @@
+"""
+Regex utilities for product collectors.
+
+Provides an optional linear-time (RE2) backend for HTML scanning patterns.
+"""
+
+import re
+from typing import Any, AnyStr
+
+try:
+    import re2  # type: ignore
+    _HAS_RE2 = True
+except Exception:
+    _HAS_RE2 = False
+
+
+# re flags that have an RE2 inline-flag equivalent
+_INLINE_FLAGS = (
+    (re.IGNORECASE, "i"),
+    (re.DOTALL, "s"),
+    (re.MULTILINE, "m"),
+)
+
+
+def compile_linear(pattern: AnyStr, flags: int = 0) -> Any:
+    """
+    Compile a pattern with RE2 when available, falling back to ``re``.
+
+    RE2 matches in linear time, so lazy ``.*?`` scans over whole HTML
+    documents cannot backtrack catastrophically. Only use this for
+    patterns RE2 accepts (no lookaround or backreferences); anything RE2
+    rejects silently falls back to ``re``.
+
+    Args:
+        pattern: Regular expression source (str, or bytes to scan raw bodies)
+        flags: ``re`` flags (IGNORECASE, DOTALL and MULTILINE are honored)
+
+    Returns:
+        Compiled pattern exposing search/finditer/findall/sub
+    """
+    if _HAS_RE2:
+        inline = "".join(ch for flag, ch in _INLINE_FLAGS if flags & flag)
+        if inline:
+            prefix = f"(?{inline})"
+            if isinstance(pattern, bytes):
+                pattern = prefix.encode("ascii") + pattern
+            else:
+                pattern = prefix + pattern
+        try:
+            return re2.compile(pattern)
+        except Exception:
+            pass
+    return re.compile(pattern, flags)
@@ -9,6 +9,10 @@ import re
 from typing import Optional
 
 
+_RE_BR = re.compile(r"<\s*br\s*/?>", re.I)
+_RE_TAG = re.compile(r"<[^>]+>")
+
+
 def text_only(s: Optional[str]) -> str:
     """
     Strip HTML tags and unescape HTML entities.
@@ -23,10 +27,13 @@ def text_only(s: Optional[str]) -> str:
     """
     if s is None:
         return ""
+    # No tags at all (typical for label text): only entities to resolve
+    if "<" not in s:
+        return html.unescape(s).strip()
     # Convert <br> tags to newlines
-    s = re.sub(r"<\s*br\s*/?>", "\n", s, flags=re.I)
+    s = _RE_BR.sub("\n", s)
     # Remove all HTML tags
-    s = re.sub(r"<[^>]+>", "", s)
+    s = _RE_TAG.sub("", s)
     # Unescape HTML entities
     return html.unescape(s).strip()
 
@@ -46,9 +53,9 @@ def plain_text(html_content: Optional[str]) -> str:
     if not html_content:
         return ""
     # Convert <br> tags to newlines
-    txt = re.sub(r"<\s*br\s*/?>", "\n", html_content, flags=re.I)
+    txt = _RE_BR.sub("\n", html_content)
     # Remove all HTML tags
-    txt = re.sub(r"<[^>]+>", " ", txt)
+    txt = _RE_TAG.sub(" ", txt)
     # Normalize horizontal whitespace
     txt = re.sub(r"[ \t\r\f\v]+", " ", txt)
     # Normalize vertical whitespace
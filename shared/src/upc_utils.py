@@ -8,6 +8,9 @@ import re
 from typing import Optional
 
 
+_NON_DIGIT = re.compile(r"\D")
+
+
 def normalize_upc(upc: Optional[str]) -> str:
     """
     Normalize UPC to digits only.
@@ -22,7 +25,7 @@ def normalize_upc(upc: Optional[str]) -> str:
     """
     if not upc:
         return ""
-    return re.sub(r"\D", "", str(upc))
+    return _NON_DIGIT.sub("", str(upc))
 
 
 def is_valid_upc(upc: str) -> bool: